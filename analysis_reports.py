@@ -0,0 +1,351 @@
+"""
+技术分析报告模块
+根据行情数据生成各类技术分析文本报告，供图形界面显示
+函数只依赖指标和信号模块，可在独立进程中执行；分析失败时抛出异常，不返回错误文本
+"""
+import numpy as np
+import pandas as pd
+from datetime import datetime
+from typing import Dict
+
+from technical_indicators import tech_indicators
+from trading_signals import signal_generator
+
+# 数据库列名 -> 技术指标模块列名
+OHLC_COLUMNS = {
+    'open_price': 'open',
+    'high_price': 'high',
+    'low_price': 'low',
+    'close_price': 'close'
+}
+
+def to_ohlc(data: pd.DataFrame) -> pd.DataFrame:
+    """重命名列以匹配技术指标模块的期望"""
+    return data.rename(columns=OHLC_COLUMNS)
+
+def comprehensive_technical_analysis(data: pd.DataFrame, exchange: str, product: str) -> str:
+    """综合技术分析"""
+    try:
+        # 重命名列以匹配技术指标模块的期望
+        analysis_data = to_ohlc(data)
+        
+        # 执行综合分析
+        indicators = tech_indicators.comprehensive_analysis(analysis_data)
+        
+        # 生成交易建议
+        recommendation = signal_generator.generate_trading_recommendation(analysis_data)
+        
+        # 格式化结果
+        parts = [f"=== {exchange}-{product} 综合技术分析报告 ===\n\n"]
+        parts.append(f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n")
+        trade_dates = data['trade_date']
+        parts.append(f"数据范围: {trade_dates.min():%Y-%m-%d} 至 {trade_dates.max():%Y-%m-%d}\n")
+        parts.append(f"数据条数: {len(data)} 条\n\n")
+        
+        # 当前价格信息（按列取标量，不构造混合类型的行Series）
+        last = len(data) - 1
+        parts.append("=== 当前价格信息 ===\n")
+        parts.append(f"最新价格: {data['close_price'].iat[last]:.2f}\n")
+        parts.append(f"开盘价: {data['open_price'].iat[last]:.2f}\n")
+        parts.append(f"最高价: {data['high_price'].iat[last]:.2f}\n")
+        parts.append(f"最低价: {data['low_price'].iat[last]:.2f}\n")
+        parts.append(f"成交量: {data['volume'].iat[last]:,.0f}\n\n")
+        
+        # 技术指标
+        if indicators:
+            parts.append("=== 主要技术指标 ===\n")
+            latest_idx = -1
+            
+            if 'sma_20' in indicators and len(indicators['sma_20']) > 0:
+                sma20 = indicators['sma_20'].iloc[latest_idx]
+                parts.append(f"SMA(20): {sma20:.2f}\n")
+            
+            if 'ema_12' in indicators and len(indicators['ema_12']) > 0:
+                ema12 = indicators['ema_12'].iloc[latest_idx]
+                parts.append(f"EMA(12): {ema12:.2f}\n")
+            
+            if 'rsi' in indicators and len(indicators['rsi']) > 0:
+                rsi = indicators['rsi'].iloc[latest_idx]
+                parts.append(f"RSI(14): {rsi:.2f}\n")
+            
+            if 'adx' in indicators and len(indicators['adx']) > 0:
+                adx = indicators['adx'].iloc[latest_idx]
+                parts.append(f"ADX: {adx:.2f}\n")
+            
+            if 'trend_strength' in indicators and len(indicators['trend_strength']) > 0:
+                trend_str = indicators['trend_strength'].iloc[latest_idx]
+                parts.append(f"趋势强度: {trend_str:.3f}\n\n")
+        
+        # 交易建议
+        if recommendation:
+            parts.append("=== 交易建议 ===\n")
+            parts.append(f"建议: {recommendation.get('recommendation', 'N/A')}\n")
+            parts.append(f"操作: {recommendation.get('action', 'N/A')}\n")
+            parts.append(f"信号强度: {recommendation.get('signal_strength', 0):.3f}\n")
+            parts.append(f"市场状态: {recommendation.get('market_regime', 'N/A')}\n\n")
+            
+            # 支撑阻力位
+            support_levels = recommendation.get('support_levels', [])
+            resistance_levels = recommendation.get('resistance_levels', [])
+            
+            if support_levels:
+                parts.append("支撑位: " + ", ".join([f"{level:.2f}" for level in support_levels]) + "\n")
+            if resistance_levels:
+                parts.append("阻力位: " + ", ".join([f"{level:.2f}" for level in resistance_levels]) + "\n")
+        
+        return "".join(parts)
+        
+    except Exception as e:
+        raise RuntimeError(f"综合技术分析失败: {e}") from e
+
+def wyckoff_analysis(data: pd.DataFrame, exchange: str, product: str) -> str:
+    """维科夫量价分析"""
+    try:
+        parts = [f"=== {exchange}-{product} 维科夫量价分析 ===\n\n"]
+        
+        # 列只提取一次
+        high = data['high_price']
+        low = data['low_price']
+        close = data['close_price']
+        volume = data['volume']
+        
+        # 计算维科夫指标
+        ad_line = tech_indicators.wyckoff_accumulation_distribution(high, low, close, volume)
+        pvt = tech_indicators.wyckoff_price_volume_trend(close, volume)
+        
+        # 成交量分析
+        volume_profile = tech_indicators.volume_profile(high, low, close, volume)
+        
+        # 转为ndarray，避免多次pandas标量索引
+        ad_values = ad_line.to_numpy()
+        pvt_values = pvt.to_numpy()
+        close_values = close.to_numpy()
+        
+        # 分析结果
+        latest_ad = ad_values[-1] if ad_values.size > 0 else 0
+        latest_pvt = pvt_values[-1] if pvt_values.size > 0 else 0
+        
+        parts.append(f"累积/分布线(A/D): {latest_ad:.0f}\n")
+        parts.append(f"价量趋势(PVT): {latest_pvt:.0f}\n\n")
+        
+        # 成交量分布分析
+        if volume_profile:
+            poc_price = volume_profile.get('poc_price', 0)
+            total_volume = volume_profile.get('total_volume', 0)
+            parts.append(f"成交量集中价位(POC): {poc_price:.2f}\n")
+            parts.append(f"总成交量: {total_volume:,.0f}\n\n")
+        
+        # 趋势判断
+        ad_trend = "上升" if latest_ad > ad_values[-10] else "下降"
+        pvt_trend = "上升" if latest_pvt > pvt_values[-10] else "下降"
+        
+        parts.append(f"A/D线趋势: {ad_trend}\n")
+        parts.append(f"PVT趋势: {pvt_trend}\n\n")
+        
+        # 维科夫信号
+        price_rising = close_values[-1] > close_values[-5]
+        ad_falling = latest_ad < ad_values[-5]
+        
+        if price_rising and ad_falling:
+            parts.append("⚠️ 警告: 价格上涨但A/D线下降，可能存在看跌背离\n")
+        elif not price_rising and latest_ad > ad_values[-5]:
+            parts.append("📈 机会: 价格下跌但A/D线上升，可能存在看涨背离\n")
+        else:
+            parts.append("📊 价格与A/D线趋势一致\n")
+        
+        return "".join(parts)
+        
+    except Exception as e:
+        raise RuntimeError(f"维科夫分析失败: {e}") from e
+
+def trend_strength_analysis(data: pd.DataFrame, exchange: str, product: str) -> str:
+    """趋势强度分析"""
+    try:
+        parts = [f"=== {exchange}-{product} 趋势强度分析 ===\n\n"]
+        
+        close = data['close_price']
+        
+        trend_strength = tech_indicators.trend_strength(close)
+        adx_data = tech_indicators.adx(data['high_price'], data['low_price'], close)
+        
+        trend_values = trend_strength.to_numpy()
+        adx_values = adx_data['adx'].to_numpy() if 'adx' in adx_data else np.empty(0)
+        
+        latest_trend = trend_values[-1] if trend_values.size > 0 else 0
+        latest_adx = adx_values[-1] if adx_values.size > 0 else 0
+        
+        parts.append(f"趋势强度指标: {latest_trend:.3f}\n")
+        parts.append(f"ADX指标: {latest_adx:.2f}\n\n")
+        
+        # 趋势评估
+        if latest_trend > 0.7:
+            trend_desc = "极强趋势"
+        elif latest_trend > 0.5:
+            trend_desc = "强趋势"
+        elif latest_trend > 0.3:
+            trend_desc = "中等趋势"
+        else:
+            trend_desc = "弱趋势或震荡"
+        
+        parts.append(f"趋势评估: {trend_desc}\n")
+        
+        if latest_adx > 25:
+            adx_desc = "趋势强劲"
+        elif latest_adx > 20:
+            adx_desc = "趋势中等"
+        else:
+            adx_desc = "趋势较弱"
+        
+        parts.append(f"ADX评估: {adx_desc}\n\n")
+        
+        # 交易建议
+        if latest_trend > 0.5 and latest_adx > 25:
+            parts.append("💡 建议: 适合趋势跟随策略\n")
+        elif latest_trend < 0.3 and latest_adx < 20:
+            parts.append("💡 建议: 适合震荡交易策略\n")
+        else:
+            parts.append("💡 建议: 谨慎观望，等待明确趋势\n")
+        
+        return "".join(parts)
+        
+    except Exception as e:
+        raise RuntimeError(f"趋势强度分析失败: {e}") from e
+
+def sideways_analysis(data: pd.DataFrame, exchange: str, product: str) -> str:
+    """震荡识别分析"""
+    try:
+        parts = [f"=== {exchange}-{product} 震荡识别分析 ===\n\n"]
+        
+        # 列只提取一次
+        high = data['high_price']
+        low = data['low_price']
+        close = data['close_price']
+        
+        sideways = tech_indicators.sideways_market_detection(high, low, close)
+        
+        breakout_data = tech_indicators.breakout_potential(high, low, close, data['volume'])
+        
+        sideways_values = sideways.to_numpy()
+        close_values = close.to_numpy()
+        
+        # 当前状态
+        is_sideways = sideways_values[-1] if sideways_values.size > 0 else 0
+        
+        if is_sideways:
+            parts.append("📊 当前状态: 震荡市场\n\n")
+            
+            # 震荡区间
+            support_level = np.nanmin(low.to_numpy()[-20:])
+            resistance_level = np.nanmax(high.to_numpy()[-20:])
+            
+            parts.append(f"震荡区间:\n")
+            parts.append(f"  支撑位: {support_level:.2f}\n")
+            parts.append(f"  阻力位: {resistance_level:.2f}\n")
+            parts.append(f"  区间幅度: {(resistance_level - support_level) / support_level:.2%}\n\n")
+            
+            # 突破潜力分析
+            if 'bb_squeeze' in breakout_data:
+                bb_squeeze = breakout_data['bb_squeeze'].iloc[-1]
+                volume_spike = breakout_data['volume_spike'].iloc[-1]
+                
+                if bb_squeeze:
+                    parts.append("⚠️ 布林带收缩，可能即将突破\n")
+                if volume_spike:
+                    parts.append("📈 成交量异常放大\n")
+                
+                if bb_squeeze and volume_spike:
+                    parts.append("💥 高突破概率！建议关注方向选择\n")
+            
+        else:
+            parts.append("📈 当前状态: 趋势市场\n")
+            
+            # 趋势方向
+            price_change = (close_values[-1] - close_values[-20]) / close_values[-20]
+            direction = "上涨" if price_change > 0 else "下跌"
+            parts.append(f"趋势方向: {direction}\n")
+            parts.append(f"20日涨跌幅: {price_change:.2%}\n")
+        
+        return "".join(parts)
+        
+    except Exception as e:
+        raise RuntimeError(f"震荡识别分析失败: {e}") from e
+
+def support_resistance_analysis(data: pd.DataFrame, exchange: str, product: str) -> str:
+    """支撑阻力分析"""
+    try:
+        parts = [f"=== {exchange}-{product} 支撑阻力分析 ===\n\n"]
+        
+        close = data['close_price']
+        
+        sr_levels = tech_indicators.support_resistance_levels(
+            data['high_price'], data['low_price'], close
+        )
+        
+        current_price = close.to_numpy()[-1]
+        parts.append(f"当前价格: {current_price:.2f}\n\n")
+        
+        # 支撑位分析
+        support_levels = sr_levels.get('support_levels', [])
+        if support_levels:
+            parts.append("📉 主要支撑位:\n")
+            for i, level in enumerate(support_levels[:5]):
+                distance = (current_price - level) / current_price
+                parts.append(f"  支撑{i+1}: {level:.2f} (距离: {distance:.2%})\n")
+            parts.append("\n")
+        
+        # 阻力位分析
+        resistance_levels = sr_levels.get('resistance_levels', [])
+        if resistance_levels:
+            parts.append("📈 主要阻力位:\n")
+            for i, level in enumerate(resistance_levels[:5]):
+                distance = (level - current_price) / current_price
+                parts.append(f"  阻力{i+1}: {level:.2f} (距离: {distance:.2%})\n")
+            parts.append("\n")
+        
+        # 关键位分析
+        support_arr = np.asarray(support_levels, dtype=np.float64)
+        resistance_arr = np.asarray(resistance_levels, dtype=np.float64)
+        below = support_arr < current_price
+        above = resistance_arr > current_price
+        nearest_support = support_arr[below].max() if below.any() else 0
+        nearest_resistance = resistance_arr[above].min() if above.any() else float('inf')
+        
+        if nearest_support > 0:
+            support_distance = (current_price - nearest_support) / current_price
+            parts.append(f"🔻 最近支撑位: {nearest_support:.2f} (距离: {support_distance:.2%})\n")
+        
+        if nearest_resistance < float('inf'):
+            resistance_distance = (nearest_resistance - current_price) / current_price
+            parts.append(f"🔺 最近阻力位: {nearest_resistance:.2f} (距离: {resistance_distance:.2%})\n")
+        
+        # 交易建议
+        parts.append("\n💡 交易建议:\n")
+        if nearest_support > 0 and support_distance < 0.02:
+            parts.append("- 接近支撑位，关注反弹机会\n")
+        if nearest_resistance < float('inf') and resistance_distance < 0.02:
+            parts.append("- 接近阻力位，注意回调风险\n")
+        
+        return "".join(parts)
+        
+    except Exception as e:
+        raise RuntimeError(f"支撑阻力分析失败: {e}") from e
+
+# 分析类型 -> 报告生成函数
+ANALYSIS_FUNCTIONS = {
+    "综合技术分析": comprehensive_technical_analysis,
+    "维科夫量价分析": wyckoff_analysis,
+    "趋势强度分析": trend_strength_analysis,
+    "震荡识别": sideways_analysis,
+    "支撑阻力分析": support_resistance_analysis
+}
+
+def run_analysis(analysis_type: str, columns: Dict[str, np.ndarray], exchange: str, product: str) -> str:
+    """按分析类型生成报告，columns为列名到数组的映射（便于跨进程传递）"""
+    analysis_func = ANALYSIS_FUNCTIONS.get(analysis_type)
+    if analysis_func is None:
+        raise ValueError(f"未知的分析类型: {analysis_type}")
+    return analysis_func(pd.DataFrame(columns), exchange, product)
+
+def warm_up() -> None:
+    """提前启动工作进程，并预热指标计算路径"""
+    tech_indicators.warm_up()
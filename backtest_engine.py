@@ -6,6 +6,7 @@ import pandas as pd
 import numpy as np
 import logging
 from typing import Dict, List, Tuple, Optional
+import queue
 from datetime import datetime, timedelta
 import matplotlib.pyplot as plt
 from trading_signals import signal_generator
@@ -274,8 +275,13 @@ class BacktestEngine:
             self.logger.error(f"计算组合价值失败: {e}")
             return self.current_capital
     
-    def run_backtest(self, data: pd.DataFrame, symbol: str = 'unknown') -> Dict:
-        """运行回测"""
+    def run_backtest(self, data: pd.DataFrame, symbol: str = 'unknown',
+                     progress_queue: Optional[queue.Queue] = None,
+                     progress_interval: int = 20) -> Dict:
+        """运行回测
+        
+        progress_queue: 可选，每处理progress_interval根K线放入一条(日期, 组合价值)进度
+        """
         try:
             self.logger.info(f"开始回测: {symbol}, 数据长度: {len(data)}")
             
@@ -337,6 +343,9 @@ class BacktestEngine:
                     self.daily_returns.append(daily_return)
                 else:
                     self.daily_returns.append(0)
+                
+                if progress_queue is not None and (i + 1) % progress_interval == 0:
+                    progress_queue.put((date, portfolio_value))
             
             # 平仓所有剩余持仓
             final_price = data['close'].iloc[-1]
@@ -267,13 +267,22 @@ class DatabaseManager:
     
     def get_continuous_contract_data(self, exchange: str = None, product_code: str = None,
                                    contract_type: str = None, start_date: str = None, 
-                                   end_date: str = None) -> pd.DataFrame:
-        """获取连续合约数据"""
+                                   end_date: str = None, columns: List[str] = None) -> pd.DataFrame:
+        """获取连续合约数据
+        
+        columns: 只返回指定的列，默认返回全部列
+        """
         connection = None
         try:
             connection = self.get_connection()
             
-            query = "SELECT * FROM continuous_contracts WHERE 1=1"
+            if columns:
+                select_list = sql.SQL(', ').join(sql.Identifier(col) for col in columns)
+            else:
+                select_list = sql.SQL('*')
+            query = sql.SQL("SELECT {} FROM continuous_contracts WHERE 1=1").format(
+                select_list
+            ).as_string(connection)
             params = []
             
             if exchange:
@@ -299,6 +308,11 @@ class DatabaseManager:
             query += " ORDER BY trade_date, exchange, product_code"
             
             df = pd.read_sql_query(query, connection, params=params)
+            
+            # 日期统一转换为datetime64，后续比较和绘图无需再解析
+            if 'trade_date' in df.columns:
+                df['trade_date'] = pd.to_datetime(df['trade_date'])
+            
             self.logger.info(f"获取到 {len(df)} 条连续合约数据")
             return df
             
@@ -335,6 +349,31 @@ class DatabaseManager:
                 cursor.close()
                 self.return_connection(connection)
     
+    def get_products_by_exchange(self) -> Dict[str, List[str]]:
+        """一次查询获取所有交易所的品种列表"""
+        connection = None
+        try:
+            connection = self.get_connection()
+            cursor = connection.cursor()
+            
+            cursor.execute(
+                "SELECT exchange, product_code FROM futures_daily_data "
+                "GROUP BY exchange, product_code ORDER BY exchange, product_code"
+            )
+            
+            products_by_exchange = {}
+            for exchange, product_code in cursor.fetchall():
+                products_by_exchange.setdefault(exchange, []).append(product_code)
+            return products_by_exchange
+            
+        except Exception as e:
+            self.logger.error(f"获取交易所品种列表失败: {e}")
+            return {}
+        finally:
+            if connection:
+                cursor.close()
+                self.return_connection(connection)
+    
     def check_connection(self) -> bool:
         """检查数据库连接状态"""
         connection = None
@@ -3,10 +3,16 @@
 """
 import tkinter as tk
 import logging
+import re
+import time
 from tkinter import ttk, filedialog, messagebox, scrolledtext
-import threading
+import queue
+from collections import OrderedDict
+from bisect import bisect_left, bisect_right
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
 from datetime import datetime, timedelta
-from typing import Dict, List
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import pandas as pd
 import matplotlib.pyplot as plt
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
@@ -18,16 +24,128 @@ from ttkthemes import ThemedTk
 from data_manager import data_manager
 from database import db_manager
 from config import GUI_CONFIG, EXCHANGES
-from technical_indicators import tech_indicators
 from trading_signals import signal_generator
 from backtest_engine import backtest_engine
 from data_upload import data_uploader
 from custom_indicators import custom_indicator_builder
 from live_trading_interface import live_trading_manager
+from analysis_reports import run_analysis, to_ohlc, warm_up
+
+# 信号值 -> 信号描述
+SIGNAL_DESC = {
+    2: "强烈买入",
+    1: "买入",
+    0: "观望",
+    -1: "卖出",
+    -2: "强烈卖出"
+}
+
+# 子信号名称
+SIGNAL_NAMES = {
+    'ma_crossover': '均线交叉',
+    'macd': 'MACD',
+    'rsi': 'RSI',
+    'bollinger': '布林带',
+    'wyckoff': '维科夫',
+    'support_resistance': '支撑阻力',
+    'trend_following': '趋势跟随',
+    'breakout': '突破'
+}
+
+# 日期选择控件统一样式
+DATE_ENTRY_OPTIONS = {
+    'width': 12,
+    'background': 'darkblue',
+    'foreground': 'white',
+    'borderwidth': 2,
+    'date_pattern': 'y-mm-dd'
+}
+
+COMBOBOX_WIDTH = 15
+
+ANALYSIS_TYPES = ["综合技术分析", "维科夫量价分析", "趋势强度分析", "震荡识别", "支撑阻力分析"]
+INTERFACE_TYPES = ["模拟交易", "CTA接口"]
+EXCHANGE_KEYS = tuple(EXCHANGES.keys())  # 交易所代码，供下拉框复用
+
+# 交易状态文本按"=== 标题 ==="分段
+STATUS_SECTION_PATTERN = re.compile(r'(?m)^(?==== )')
+
+# 图表和分析只用到的连续合约数据列
+OHLCV_COLUMNS = ('trade_date', 'open_price', 'high_price', 'low_price', 'close_price', 'volume')
+
+# 最近一次格式化的时间（秒, 文本），同一秒内复用
+_now_cache = (0, "")
+
+def _fmt_now() -> str:
+    """当前时间文本（秒级精度，同一秒内不重复格式化）"""
+    global _now_cache
+    second = int(time.time())
+    cached_second, text = _now_cache
+    if second != cached_second:
+        text = datetime.fromtimestamp(second).strftime('%Y-%m-%d %H:%M:%S')
+        _now_cache = (second, text)
+    return text
+
+# 策略评估分级：(名称, 指标, 升序阈值, 是否越大越好)，超过阈值(越小越好时低于阈值)升一级
+_RATINGS = (
+    ("收益表现", 'total_return', (0.05, 0.1), True),
+    ("风险调整收益", 'sharpe_ratio', (1.0, 1.5), True),
+    ("回撤控制", 'max_drawdown', (0.1, 0.2), False),
+    ("胜率", 'win_rate', (0.4, 0.5), True)
+)
+_RATING_LABELS = ("❌ {}: 不佳", "🔶 {}: 良好", "✅ {}: 优秀")
+
+@lru_cache(maxsize=128)
+def _format_report_cached(summary_items: tuple) -> Tuple[str, ...]:
+    """按回测汇总指标生成报告正文各段落（结果缓存，相同汇总直接复用）"""
+    summary = dict(summary_items)
+    g = summary.get
+    
+    # 评估用指标只取一次，资金表现和策略评估共用
+    metrics = {key: g(key, 0) for _, key, _, _ in _RATINGS}
+    
+    parts = [
+        "=== 资金表现 ===",
+        f"初始资金: {g('initial_capital', 0):,.2f}",
+        f"最终资金: {g('final_capital', 0):,.2f}",
+        f"总收益率: {metrics['total_return']:.2%}",
+        f"年化收益率: {g('annual_return', 0):.2%}",
+        f"波动率: {g('volatility', 0):.2%}",
+        f"夏普比率: {metrics['sharpe_ratio']:.3f}",
+        f"最大回撤: {metrics['max_drawdown']:.2%}",
+        ""
+    ]
+    trade_parts = [
+        "=== 交易统计 ===",
+        f"总交易次数: {g('total_trades', 0)}",
+        f"盈利次数: {g('winning_trades', 0)}",
+        f"亏损次数: {g('losing_trades', 0)}",
+        f"胜率: {metrics['win_rate']:.2%}",
+        f"盈亏比: {g('profit_factor', 0):.3f}",
+        f"平均盈利: {g('avg_win', 0):.2f}",
+        f"平均亏损: {g('avg_loss', 0):.2f}",
+        ""
+    ]
+    rating_parts = ["=== 策略评估 ==="]
+    
+    # 策略评估：按阈值表分级
+    for title, key, thresholds, higher_is_better in _RATINGS:
+        value = metrics[key]
+        if higher_is_better:
+            level = bisect_left(thresholds, value)
+        else:
+            level = len(thresholds) - bisect_right(thresholds, value)
+        rating_parts.append(_RATING_LABELS[level].format(title))
+    
+    return tuple("\n".join(section) + "\n" for section in (parts, trade_parts, rating_parts))
 
 class FuturesDataGUI:
     """期货数据管理系统GUI"""
     
+    ANALYSIS_CACHE_SIZE = 16  # 分析结果缓存条数
+    TRADING_EVENT_DEBOUNCE_MS = 200  # 交易事件合并刷新的等待时间
+    TRADING_IDLE_REFRESH_MS = 30000  # 无事件时交易状态的兜底刷新间隔
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.status_label = None #避免未初始化
@@ -39,7 +157,36 @@ class FuturesDataGUI:
         # 初始化变量
         self.current_data = pd.DataFrame()
         self.chart_frame = None
-            self.create_widgets()
+        self._products_cache = {}  # 交易所 -> 品种列表缓存
+        
+        # 分析/回测任务线程池（限制并发，避免每次点击新建线程）
+        self._executor = ThreadPoolExecutor(max_workers=2)
+        self._pending_tasks = {}  # 任务槽位 -> Future
+        self._analysis_inflight = set()  # 正在执行的(交易所, 品种, 分析类型)
+        self._analysis_cache = OrderedDict()  # 分析结果LRU缓存
+        
+        # 下载、导入、上传、查询等IO任务共用的常驻线程池
+        self._io_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="fut-worker")
+        
+        # 技术分析计算进程池（CPU密集，绕开GIL），启动时预热避免首次点击等待进程创建
+        self._cpu_pool = ProcessPoolExecutor(max_workers=2)
+        for _ in range(2):
+            self._cpu_pool.submit(warm_up)
+        
+        # 交易状态变化事件（由交易模块推送，主线程批量处理）
+        self._trading_events = queue.Queue()
+        self._trading_drain_scheduled = False
+        self._trading_status_stale = False
+        self._status_generation = 0  # 交易状态刷新序号，只显示最新一次的结果
+        self._last_status_text = ""  # 交易状态文本框当前内容
+        
+        # 回测数值参数（输入框编辑时解析缓存）
+        self._initial_capital = 0.0
+        self._commission = 0.0
+        self._position_size = 0.0
+        self._invalid_params = set()
+        self._backtest_run = None  # 当前回测的进度队列
+        self._backtest_report_started = False
         
         # 设置样式
         self.setup_styles()
@@ -50,9 +197,11 @@ class FuturesDataGUI:
         # 注册数据管理器回调
         data_manager.add_update_callback(self.update_status)
         
-        # 初始化分析和回测页面选项
+        # 初始化分析页面选项
         self.init_analysis_options()
-        self.init_backtest_options()
+        
+        # 后台预加载各交易所品种列表
+        self.preload_products()
         
         # 初始化状态
         self.update_data_summary()
@@ -68,6 +217,33 @@ class FuturesDataGUI:
         # 配置标签样式
         style.configure("Title.TLabel", font=("Arial", 12, "bold"))
         style.configure("Status.TLabel", font=("Arial", 9))
+        
+        # 输入无效时的输入框样式
+        style.configure("Invalid.TEntry", foreground="red")
+    
+    def create_date_entry(self, parent) -> DateEntry:
+        """创建统一样式的日期选择控件"""
+        return DateEntry(parent, **DATE_ENTRY_OPTIONS)
+    
+    def create_float_entry(self, parent, variable: tk.StringVar, attr: str) -> ttk.Entry:
+        """创建数值输入框，编辑时解析并把结果缓存到attr属性"""
+        setattr(self, attr, float(variable.get()))
+        entry = ttk.Entry(parent, textvariable=variable, width=15, validate='key')
+        vcmd = self.root.register(lambda text: self._validate_float(entry, attr, text))
+        entry.config(validatecommand=(vcmd, '%P'))
+        return entry
+    
+    def _validate_float(self, entry: ttk.Entry, attr: str, text: str) -> bool:
+        """校验数值输入：合法时更新缓存值，非法时标红（不阻止继续编辑）"""
+        try:
+            setattr(self, attr, float(text))
+        except ValueError:
+            self._invalid_params.add(attr)
+            entry.config(style="Invalid.TEntry")
+        else:
+            self._invalid_params.discard(attr)
+            entry.config(style="TEntry")
+        return True
     
     def create_widgets(self):
         """创建界面组件"""
@@ -88,9 +264,23 @@ class FuturesDataGUI:
         self.create_settings_tab()
         self.create_log_tab()
         
+        # 回测和实盘交易页在首次切换时再构建
+        self.notebook.bind('<<NotebookTabChanged>>', self.on_tab_changed)
+        
         # 创建状态栏
         self.create_status_bar(main_frame)
     
+    def on_tab_changed(self, event=None):
+        """标签页切换事件，按需构建延迟加载的标签页"""
+        selected = self.notebook.select()
+        if selected == str(self.backtest_frame) and not self._backtest_tab_built:
+            self.build_backtest_tab()
+        elif selected == str(self.live_trading_frame):
+            if not self._live_trading_tab_built:
+                self.build_live_trading_tab()
+            elif self._trading_status_stale:
+                self.update_trading_status()
+    
     def create_data_management_tab(self):
         """创建数据管理标签页"""
         data_frame = ttk.Frame(self.notebook)
@@ -106,27 +296,19 @@ class FuturesDataGUI:
         
         # 日期选择
         ttk.Label(download_frame, text="开始日期:").pack(anchor=tk.W)
-        self.start_date_entry = DateEntry(download_frame, width=12, 
-                                         background='darkblue',
-                                         foreground='white', 
-                                         borderwidth=2,
-                                         date_pattern='y-mm-dd')
+        self.start_date_entry = self.create_date_entry(download_frame)
         self.start_date_entry.pack(pady=(0, 5))
         self.start_date_entry.set_date(datetime.now() - timedelta(days=30))
         
         ttk.Label(download_frame, text="结束日期:").pack(anchor=tk.W)
-        self.end_date_entry = DateEntry(download_frame, width=12,
-                                       background='darkblue',
-                                       foreground='white',
-                                       borderwidth=2,
-                                       date_pattern='y-mm-dd')
+        self.end_date_entry = self.create_date_entry(download_frame)
         self.end_date_entry.pack(pady=(0, 5))
         
         # 交易所选择
         ttk.Label(download_frame, text="交易所:").pack(anchor=tk.W)
         self.exchange_var = tk.StringVar()
         exchange_combo = ttk.Combobox(download_frame, textvariable=self.exchange_var,
-                                     values=list(EXCHANGES.keys()) + ["全部"])
+                                     values=EXCHANGE_KEYS + ("全部",))
         exchange_combo.pack(pady=(0, 5))
         exchange_combo.set("全部")
         
@@ -196,17 +378,17 @@ class FuturesDataGUI:
         # 产品选择
         ttk.Label(chart_control_frame, text="交易所:").pack(anchor=tk.W)
         self.chart_exchange_var = tk.StringVar()
-        chart_exchange_combo = ttk.Combobox(chart_control_frame, 
-                                           textvariable=self.chart_exchange_var,
-                                           width=15)
-        chart_exchange_combo.pack(pady=(0, 5))
-        chart_exchange_combo.bind('<<ComboboxSelected>>', self.on_exchange_selected)
+        self.chart_exchange_combo = ttk.Combobox(chart_control_frame, 
+                                                textvariable=self.chart_exchange_var,
+                                                width=COMBOBOX_WIDTH)
+        self.chart_exchange_combo.pack(pady=(0, 5))
+        self.chart_exchange_combo.bind('<<ComboboxSelected>>', self.on_exchange_selected)
         
         ttk.Label(chart_control_frame, text="品种:").pack(anchor=tk.W)
         self.chart_product_var = tk.StringVar()
         self.chart_product_combo = ttk.Combobox(chart_control_frame,
                                                textvariable=self.chart_product_var,
-                                               width=15)
+                                               width=COMBOBOX_WIDTH)
         self.chart_product_combo.pack(pady=(0, 5))
         
         # 合约类型选择
@@ -215,26 +397,18 @@ class FuturesDataGUI:
         contract_type_combo = ttk.Combobox(chart_control_frame,
                                           textvariable=self.contract_type_var,
                                           values=["主力合约", "加权合约"],
-                                          width=15)
+                                          width=COMBOBOX_WIDTH)
         contract_type_combo.pack(pady=(0, 5))
         contract_type_combo.set("主力合约")
         
         # 日期范围选择
         ttk.Label(chart_control_frame, text="开始日期:").pack(anchor=tk.W)
-        self.chart_start_date = DateEntry(chart_control_frame, width=12,
-                                         background='darkblue',
-                                         foreground='white',
-                                         borderwidth=2,
-                                         date_pattern='y-mm-dd')
+        self.chart_start_date = self.create_date_entry(chart_control_frame)
         self.chart_start_date.pack(pady=(0, 5))
         self.chart_start_date.set_date(datetime.now() - timedelta(days=90))
         
         ttk.Label(chart_control_frame, text="结束日期:").pack(anchor=tk.W)
-        self.chart_end_date = DateEntry(chart_control_frame, width=12,
-                                       background='darkblue',
-                                       foreground='white',
-                                       borderwidth=2,
-                                       date_pattern='y-mm-dd')
+        self.chart_end_date = self.create_date_entry(chart_control_frame)
         self.chart_end_date.pack(pady=(0, 5))
         
         # 图表类型选择
@@ -243,7 +417,7 @@ class FuturesDataGUI:
         chart_type_combo = ttk.Combobox(chart_control_frame,
                                        textvariable=self.chart_type_var,
                                        values=["K线图", "收盘价线图", "成交量柱状图"],
-                                       width=15)
+                                       width=COMBOBOX_WIDTH)
         chart_type_combo.pack(pady=(0, 5))
         chart_type_combo.set("K线图")
         
@@ -265,26 +439,24 @@ class FuturesDataGUI:
     def init_analysis_options(self):
         """初始化分析页面选项"""
         try:
-            exchanges = list(EXCHANGES.keys())
+            exchanges = EXCHANGE_KEYS
             self.analysis_exchange_combo['values'] = exchanges
             self.analysis_product_combo['values'] = []
             
             if exchanges:
                 self.analysis_exchange_var.set(exchanges[0])
-                self.on_analysis_exchange_selected()
         except Exception as e:
             self.logger.error(f"初始化分析选项失败: {e}")
     
     def init_backtest_options(self):
         """初始化回测页面选项"""
         try:
-            exchanges = list(EXCHANGES.keys())
+            exchanges = EXCHANGE_KEYS
             self.backtest_exchange_combo['values'] = exchanges
             self.backtest_product_combo['values'] = []
             
             if exchanges:
                 self.backtest_exchange_var.set(exchanges[0])
-                self.on_backtest_exchange_selected()
         except Exception as e:
             self.logger.error(f"初始化回测选项失败: {e}")
     
@@ -389,6 +561,53 @@ class FuturesDataGUI:
         self.log_text.see(tk.END)
         self.root.update_idletasks()
     
+    def submit_task(self, slot: str, func: Callable, callback: Optional[Callable], *args):
+        """提交后台任务，同一槽位尚未开始的旧任务会被取消
+        
+        任务返回None表示无结果（错误已在任务内部处理或已自行显示），否则在主线程中调用callback显示结果
+        """
+        previous = self._pending_tasks.get(slot)
+        if previous is not None:
+            previous.cancel()
+        
+        future = self._executor.submit(func, *args)
+        self._pending_tasks[slot] = future
+        
+        def on_done(f):
+            if f.cancelled():
+                return
+            result = f.result()
+            if result is not None:
+                self.root.after(0, callback, result)
+        
+        future.add_done_callback(on_done)
+        return future
+    
+    def debounce(self, delay_ms: int, func: Callable) -> Callable:
+        """返回防抖包装函数，连续触发时只在最后一次触发delay_ms毫秒后执行一次"""
+        after_id = None
+        
+        def fire():
+            nonlocal after_id
+            after_id = None
+            func()
+        
+        def wrapper():
+            nonlocal after_id
+            if after_id is not None:
+                self.root.after_cancel(after_id)
+            after_id = self.root.after(delay_ms, fire)
+        
+        return wrapper
+    
+    def replace_text(self, widget: tk.Text, text: str):
+        """整体替换只读文本框内容：一次删除、一次插入，更新期间不触发自动滚动"""
+        widget.config(state=tk.NORMAL)
+        widget.delete(1.0, tk.END)
+        widget.insert(1.0, text)
+        widget.mark_set(tk.INSERT, 1.0)
+        widget.config(state=tk.DISABLED)
+    
     def start_progress(self):
         """开始进度条"""
         self.progress_bar.start()
@@ -414,14 +633,14 @@ class FuturesDataGUI:
                 if raw_data:
                     # 处理并导入数据
                     data_manager.process_and_import_data(raw_data)
-                    self.root.after(0, self.update_data_summary)
+                    self.root.after(0, self._on_data_changed)
                 
             except Exception as e:
                 self.update_status(f"下载数据失败: {e}")
             finally:
                 self.stop_progress()
         
-        threading.Thread(target=download_thread, daemon=True).start()
+        self._io_executor.submit(download_thread)
     
     def import_csv_file(self):
         """导入CSV文件"""
@@ -436,13 +655,13 @@ class FuturesDataGUI:
                     self.start_progress()
                     success = data_manager.import_csv_to_database(file_path)
                     if success:
-                        self.root.after(0, self.update_data_summary)
+                        self.root.after(0, self._on_data_changed)
                 except Exception as e:
                     self.update_status(f"导入CSV失败: {e}")
                 finally:
                     self.stop_progress()
             
-            threading.Thread(target=import_thread, daemon=True).start()
+            self._io_executor.submit(import_thread)
     
     def update_daily_data(self):
         """更新当日数据"""
@@ -450,13 +669,13 @@ class FuturesDataGUI:
             try:
                 self.start_progress()
                 data_manager.update_daily_data()
-                self.root.after(0, self.update_data_summary)
+                self.root.after(0, self._on_data_changed)
             except Exception as e:
                 self.update_status(f"更新当日数据失败: {e}")
             finally:
                 self.stop_progress()
         
-        threading.Thread(target=update_thread, daemon=True).start()
+        self._io_executor.submit(update_thread)
     
     def start_scheduled_update(self):
         """启动定时更新"""
@@ -488,7 +707,7 @@ class FuturesDataGUI:
                 finally:
                     self.stop_progress()
             
-            threading.Thread(target=export_thread, daemon=True).start()
+            self._io_executor.submit(export_thread)
     
     def cleanup_old_data(self):
         """清理旧数据"""
@@ -498,13 +717,20 @@ class FuturesDataGUI:
                 try:
                     self.start_progress()
                     data_manager.cleanup_old_data()
-                    self.root.after(0, self.update_data_summary)
+                    self.root.after(0, self._on_data_changed)
                 except Exception as e:
                     self.update_status(f"清理数据失败: {e}")
                 finally:
                     self.stop_progress()
             
-            threading.Thread(target=cleanup_thread, daemon=True).start()
+            self._io_executor.submit(cleanup_thread)
+    
+    def _on_data_changed(self):
+        """数据库中的行情数据变化后调用（主线程）：清空分析结果和品种列表缓存，重新加载品种并刷新数据概要"""
+        self._analysis_cache.clear()
+        self.invalidate_products_cache()
+        self.preload_products()
+        self.update_data_summary()
     
     def update_data_summary(self):
         """更新数据概要"""
@@ -545,7 +771,7 @@ class FuturesDataGUI:
             except Exception as e:
                 self.update_status(f"获取数据概要失败: {e}")
         
-        threading.Thread(target=summary_thread, daemon=True).start()
+        self._io_executor.submit(summary_thread)
     
     def update_chart_options(self):
         """更新图表选项"""
@@ -566,13 +792,46 @@ class FuturesDataGUI:
             except Exception as e:
                 self.update_status(f"更新图表选项失败: {e}")
         
-        threading.Thread(target=update_thread, daemon=True).start()
+        self._io_executor.submit(update_thread)
+    
+    def get_cached_products(self, exchange: str) -> List[str]:
+        """获取交易所品种列表（带缓存，避免重复查询数据库）"""
+        products = self._products_cache.get(exchange)
+        if products is None:
+            products = tuple(db_manager.get_available_products(exchange))
+            self._products_cache[exchange] = products
+        return list(products)
+    
+    def preload_products(self):
+        """后台预加载所有交易所的品种列表"""
+        def preload_thread():
+            try:
+                products_by_exchange = db_manager.get_products_by_exchange()
+                for exchange in EXCHANGES:
+                    self._products_cache[exchange] = tuple(products_by_exchange.get(exchange, []))
+                for exchange, products in products_by_exchange.items():
+                    self._products_cache.setdefault(exchange, tuple(products))
+                
+                def update_ui():
+                    self.on_analysis_exchange_selected()
+                    if self._backtest_tab_built:
+                        self.on_backtest_exchange_selected()
+                
+                self.root.after(0, update_ui)
+            except Exception as e:
+                self.logger.error(f"预加载品种列表失败: {e}")
+        
+        self._io_executor.submit(preload_thread)
+    
+    def invalidate_products_cache(self):
+        """清空品种列表缓存（数据更新后调用）"""
+        self._products_cache.clear()
     
     def on_exchange_selected(self, event=None):
         """交易所选择事件"""
         exchange = self.chart_exchange_var.get()
         if exchange:
-            products = db_manager.get_available_products(exchange)
+            products = self.get_cached_products(exchange)
             self.chart_product_combo['values'] = products
             if products:
                 self.chart_product_var.set(products[0])
@@ -600,7 +859,8 @@ class FuturesDataGUI:
                     product_code=product,
                     contract_type=contract_type,
                     start_date=start_date,
-                    end_date=end_date
+                    end_date=end_date,
+                    columns=OHLCV_COLUMNS
                 )
                 
                 if data.empty:
@@ -615,7 +875,7 @@ class FuturesDataGUI:
             finally:
                 self.stop_progress()
         
-        threading.Thread(target=chart_thread, daemon=True).start()
+        self._io_executor.submit(chart_thread)
     
     def update_chart(self, data: pd.DataFrame, chart_type: str, exchange: str, product: str):
         """更新图表显示"""
@@ -635,8 +895,6 @@ class FuturesDataGUI:
         ax1 = self.fig.add_subplot(211)
         ax2 = self.fig.add_subplot(212)
         
-        # 转换日期
-        data['trade_date'] = pd.to_datetime(data['trade_date'])
         data = data.sort_values('trade_date')
         
         # 绘制K线图（简化版）
@@ -683,7 +941,6 @@ class FuturesDataGUI:
         """绘制收盘价线图"""
         ax = self.fig.add_subplot(111)
         
-        data['trade_date'] = pd.to_datetime(data['trade_date'])
         data = data.sort_values('trade_date')
         
         ax.plot(data['trade_date'], data['close_price'], linewidth=2, color='blue')
@@ -701,7 +958,6 @@ class FuturesDataGUI:
         """绘制成交量柱状图"""
         ax = self.fig.add_subplot(111)
         
-        data['trade_date'] = pd.to_datetime(data['trade_date'])
         data = data.sort_values('trade_date')
         
         ax.bar(data['trade_date'], data['volume'], alpha=0.7, color='green')
@@ -734,7 +990,7 @@ class FuturesDataGUI:
             finally:
                 self.stop_progress()
         
-        threading.Thread(target=test_thread, daemon=True).start()
+        self._io_executor.submit(test_thread)
     
     def import_fundamentals_data(self):
         """导入基本面数据"""
@@ -765,7 +1021,7 @@ class FuturesDataGUI:
                 finally:
                     self.stop_progress()
             
-            threading.Thread(target=import_thread, daemon=True).start()
+            self._io_executor.submit(import_thread)
     
     def clear_log(self):
         """清除日志"""
@@ -783,33 +1039,35 @@ class FuturesDataGUI:
         # 品种选择
         ttk.Label(control_frame, text="选择分析品种:").pack(anchor=tk.W)
         self.analysis_exchange_var = tk.StringVar()
-        analysis_exchange_combo = ttk.Combobox(control_frame, 
-                                             textvariable=self.analysis_exchange_var,
-                                             width=15)
-        analysis_exchange_combo.pack(pady=(0, 5))
-        analysis_exchange_combo.bind('<<ComboboxSelected>>', self.on_analysis_exchange_selected)
+        self.analysis_exchange_combo = ttk.Combobox(control_frame, 
+                                                  textvariable=self.analysis_exchange_var,
+                                                  width=COMBOBOX_WIDTH)
+        self.analysis_exchange_combo.pack(pady=(0, 5))
+        self.analysis_exchange_combo.bind('<<ComboboxSelected>>', self.on_analysis_exchange_selected)
         
         self.analysis_product_var = tk.StringVar()
         self.analysis_product_combo = ttk.Combobox(control_frame,
                                                  textvariable=self.analysis_product_var,
-                                                 width=15)
+                                                 width=COMBOBOX_WIDTH)
         self.analysis_product_combo.pack(pady=(0, 10))
         
         # 分析类型选择
         ttk.Label(control_frame, text="分析类型:").pack(anchor=tk.W)
-        analysis_types = ["综合技术分析", "维科夫量价分析", "趋势强度分析", "震荡识别", "支撑阻力分析"]
         self.analysis_type_var = tk.StringVar()
         analysis_type_combo = ttk.Combobox(control_frame,
                                          textvariable=self.analysis_type_var,
-                                         values=analysis_types,
-                                         width=15)
+                                         values=ANALYSIS_TYPES,
+                                         width=COMBOBOX_WIDTH)
         analysis_type_combo.pack(pady=(0, 10))
         analysis_type_combo.set("综合技术分析")
         
         # 执行分析按钮
-        ttk.Button(control_frame, text="执行分析",
-                  command=self.execute_analysis,
-                  style="Action.TButton").pack(pady=5)
+        analysis_button = ttk.Button(control_frame, text="执行分析",
+                                     command=self.debounce(300, self.execute_analysis),
+                                     style="Action.TButton")
+        analysis_button.pack(pady=5)
+        # Ctrl+R 跳过缓存强制重新分析（绑定在主窗口上，焦点在任意控件时都生效）
+        self.root.bind('<Control-r>', lambda e: self.execute_analysis(force_refresh=True))
         
         ttk.Button(control_frame, text="生成交易信号",
                   command=self.generate_trading_signals,
@@ -823,9 +1081,14 @@ class FuturesDataGUI:
         self.analysis_result_text.pack(fill=tk.BOTH, expand=True)
     
     def create_backtest_tab(self):
-        """创建回测标签页"""
-        backtest_frame = ttk.Frame(self.notebook)
-        self.notebook.add(backtest_frame, text="策略回测")
+        """创建回测标签页（仅占位，首次切换到该页时再构建内容）"""
+        self.backtest_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.backtest_frame, text="策略回测")
+        self._backtest_tab_built = False
+    
+    def build_backtest_tab(self):
+        """构建回测标签页内容"""
+        backtest_frame = self.backtest_frame
         
         # 左侧参数设置
         param_frame = ttk.LabelFrame(backtest_frame, text="回测参数", padding=10)
@@ -834,47 +1097,39 @@ class FuturesDataGUI:
         # 品种选择
         ttk.Label(param_frame, text="回测品种:").pack(anchor=tk.W)
         self.backtest_exchange_var = tk.StringVar()
-        backtest_exchange_combo = ttk.Combobox(param_frame,
-                                             textvariable=self.backtest_exchange_var,
-                                             width=15)
-        backtest_exchange_combo.pack(pady=(0, 5))
-        backtest_exchange_combo.bind('<<ComboboxSelected>>', self.on_backtest_exchange_selected)
+        self.backtest_exchange_combo = ttk.Combobox(param_frame,
+                                                  textvariable=self.backtest_exchange_var,
+                                                  width=COMBOBOX_WIDTH)
+        self.backtest_exchange_combo.pack(pady=(0, 5))
+        self.backtest_exchange_combo.bind('<<ComboboxSelected>>', self.on_backtest_exchange_selected)
         
         self.backtest_product_var = tk.StringVar()
         self.backtest_product_combo = ttk.Combobox(param_frame,
                                                  textvariable=self.backtest_product_var,
-                                                 width=15)
+                                                 width=COMBOBOX_WIDTH)
         self.backtest_product_combo.pack(pady=(0, 10))
         
         # 回测参数
         ttk.Label(param_frame, text="初始资金:").pack(anchor=tk.W)
         self.initial_capital_var = tk.StringVar(value="100000")
-        ttk.Entry(param_frame, textvariable=self.initial_capital_var, width=15).pack(pady=(0, 5))
+        self.create_float_entry(param_frame, self.initial_capital_var, '_initial_capital').pack(pady=(0, 5))
         
         ttk.Label(param_frame, text="手续费率:").pack(anchor=tk.W)
         self.commission_var = tk.StringVar(value="0.0003")
-        ttk.Entry(param_frame, textvariable=self.commission_var, width=15).pack(pady=(0, 5))
+        self.create_float_entry(param_frame, self.commission_var, '_commission').pack(pady=(0, 5))
         
         ttk.Label(param_frame, text="仓位比例:").pack(anchor=tk.W)
         self.position_size_var = tk.StringVar(value="0.1")
-        ttk.Entry(param_frame, textvariable=self.position_size_var, width=15).pack(pady=(0, 10))
+        self.create_float_entry(param_frame, self.position_size_var, '_position_size').pack(pady=(0, 10))
         
         # 日期范围
         ttk.Label(param_frame, text="回测开始日期:").pack(anchor=tk.W)
-        self.backtest_start_date = DateEntry(param_frame, width=12,
-                                           background='darkblue',
-                                           foreground='white',
-                                           borderwidth=2,
-                                           date_pattern='y-mm-dd')
+        self.backtest_start_date = self.create_date_entry(param_frame)
         self.backtest_start_date.pack(pady=(0, 5))
         self.backtest_start_date.set_date(datetime.now() - timedelta(days=365))
         
         ttk.Label(param_frame, text="回测结束日期:").pack(anchor=tk.W)
-        self.backtest_end_date = DateEntry(param_frame, width=12,
-                                         background='darkblue',
-                                         foreground='white',
-                                         borderwidth=2,
-                                         date_pattern='y-mm-dd')
+        self.backtest_end_date = self.create_date_entry(param_frame)
         self.backtest_end_date.pack(pady=(0, 10))
         
         # 开始回测按钮
@@ -888,11 +1143,23 @@ class FuturesDataGUI:
         
         self.backtest_result_text = scrolledtext.ScrolledText(result_frame, height=25)
         self.backtest_result_text.pack(fill=tk.BOTH, expand=True)
+        
+        self._backtest_tab_built = True
+        
+        # 初始化回测页面选项
+        self.init_backtest_options()
+        if self.backtest_exchange_var.get() in self._products_cache:
+            self.on_backtest_exchange_selected()
     
     def create_live_trading_tab(self):
-        """创建实盘交易标签页"""
-        trading_frame = ttk.Frame(self.notebook)
-        self.notebook.add(trading_frame, text="实盘交易")
+        """创建实盘交易标签页（仅占位，首次切换到该页时再构建内容）"""
+        self.live_trading_frame = ttk.Frame(self.notebook)
+        self.notebook.add(self.live_trading_frame, text="实盘交易")
+        self._live_trading_tab_built = False
+    
+    def build_live_trading_tab(self):
+        """构建实盘交易标签页内容"""
+        trading_frame = self.live_trading_frame
         
         # 左侧控制面板
         control_frame = ttk.LabelFrame(trading_frame, text="交易控制", padding=10)
@@ -900,12 +1167,11 @@ class FuturesDataGUI:
         
         # 交易接口选择
         ttk.Label(control_frame, text="交易接口:").pack(anchor=tk.W)
-        interface_types = ["模拟交易", "CTA接口"]
         self.trading_interface_var = tk.StringVar()
         interface_combo = ttk.Combobox(control_frame,
                                      textvariable=self.trading_interface_var,
-                                     values=interface_types,
-                                     width=15)
+                                     values=INTERFACE_TYPES,
+                                     width=COMBOBOX_WIDTH)
         interface_combo.pack(pady=(0, 10))
         interface_combo.set("模拟交易")
         
@@ -943,15 +1209,20 @@ class FuturesDataGUI:
         self.trading_status_text = scrolledtext.ScrolledText(status_frame, height=25)
         self.trading_status_text.pack(fill=tk.BOTH, expand=True)
         
-        # 定时更新交易状态
+        self._live_trading_tab_built = True
+        
+        # 交易状态变化时再刷新；另有低频兜底刷新，仅在交易页可见时执行
+        live_trading_manager.add_status_callback(self.on_trading_status_changed)
+        self.root.bind('<Map>', self.on_window_restored, add='+')
         self.update_trading_status()
+        self.root.after(self.TRADING_IDLE_REFRESH_MS, self._idle_refresh_trading_status)
     
     # 新增的事件处理方法
     def on_analysis_exchange_selected(self, event=None):
         """分析页面交易所选择事件"""
         exchange = self.analysis_exchange_var.get()
         if exchange:
-            products = db_manager.get_available_products(exchange)
+            products = self.get_cached_products(exchange)
             self.analysis_product_combo['values'] = products
             if products:
                 self.analysis_product_var.set(products[0])
@@ -960,598 +1231,301 @@ class FuturesDataGUI:
         """回测页面交易所选择事件"""
         exchange = self.backtest_exchange_var.get()
         if exchange:
-            products = db_manager.get_available_products(exchange)
+            products = self.get_cached_products(exchange)
             self.backtest_product_combo['values'] = products
             if products:
                 self.backtest_product_var.set(products[0])
     
-    def execute_analysis(self):
+    def execute_analysis(self, force_refresh: bool = False):
         """执行技术分析"""
-        def analysis_thread():
-            try:
-                self.start_progress()
-                
-                exchange = self.analysis_exchange_var.get()
-                product = self.analysis_product_var.get()
-                analysis_type = self.analysis_type_var.get()
-                
-                if not all([exchange, product]):
-                    self.update_status("请选择交易所和品种")
-                    return
-                
-                # 获取数据
-                end_date = datetime.now().strftime('%Y-%m-%d')
-                start_date = (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d')
-                
-                data = db_manager.get_continuous_contract_data(
-                    exchange=exchange,
-                    product_code=product,
-                    contract_type='main',
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                if data.empty:
-                    self.update_status("没有找到符合条件的数据")
-                    return
-                
-                # 执行分析
-                if analysis_type == "综合技术分析":
-                    result = self.comprehensive_technical_analysis(data, exchange, product)
-                elif analysis_type == "维科夫量价分析":
-                    result = self.wyckoff_analysis(data, exchange, product)
-                elif analysis_type == "趋势强度分析":
-                    result = self.trend_strength_analysis(data, exchange, product)
-                elif analysis_type == "震荡识别":
-                    result = self.sideways_analysis(data, exchange, product)
-                elif analysis_type == "支撑阻力分析":
-                    result = self.support_resistance_analysis(data, exchange, product)
-                else:
-                    result = "未知的分析类型"
-                
-                # 在主线程中更新结果
-                self.root.after(0, lambda: self.display_analysis_result(result))
-                
-            except Exception as e:
-                self.update_status(f"分析执行失败: {e}")
-            finally:
-                self.stop_progress()
-        
-        threading.Thread(target=analysis_thread, daemon=True).start()
+        exchange = self.analysis_exchange_var.get()
+        product = self.analysis_product_var.get()
+        analysis_type = self.analysis_type_var.get()
+        
+        if not all([exchange, product]):
+            self.update_status("请选择交易所和品种")
+            return
+        
+        # 数据范围：最近180天
+        end_date = datetime.now().strftime('%Y-%m-%d')
+        start_date = (datetime.now() - timedelta(days=180)).strftime('%Y-%m-%d')
+        
+        # 命中缓存直接显示
+        cache_key = (exchange, product, analysis_type, start_date, end_date)
+        if not force_refresh and cache_key in self._analysis_cache:
+            self._analysis_cache.move_to_end(cache_key)
+            self.display_analysis_result(self._analysis_cache[cache_key])
+            return
+        
+        # 相同分析仍在执行时忽略重复请求
+        key = (exchange, product, analysis_type)
+        if key in self._analysis_inflight:
+            self.update_status("分析正在执行中，请稍候")
+            return
+        self._analysis_inflight.add(key)
+        
+        def on_result(result: str):
+            self.cache_analysis_result(cache_key, result)
+            self.display_analysis_result(result)
+        
+        future = self.submit_task('analysis', self._run_analysis, on_result,
+                                  exchange, product, analysis_type, start_date, end_date)
+        future.add_done_callback(lambda f: self._analysis_inflight.discard(key))
     
-    def comprehensive_technical_analysis(self, data: pd.DataFrame, exchange: str, product: str) -> str:
-        """综合技术分析"""
-        try:
-            # 重命名列以匹配技术指标模块的期望
-            analysis_data = data.rename(columns={
-                'open_price': 'open',
-                'high_price': 'high',
-                'low_price': 'low',
-                'close_price': 'close'
-            })
-            
-            # 执行综合分析
-            indicators = tech_indicators.comprehensive_analysis(analysis_data)
-            
-            # 生成交易建议
-            recommendation = signal_generator.generate_trading_recommendation(analysis_data)
-            
-            # 格式化结果
-            result = f"=== {exchange}-{product} 综合技术分析报告 ===\n\n"
-            result += f"分析时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n"
-            result += f"数据范围: {data['trade_date'].min()} 至 {data['trade_date'].max()}\n"
-            result += f"数据条数: {len(data)} 条\n\n"
-            
-            # 当前价格信息
-            latest_data = data.iloc[-1]
-            result += "=== 当前价格信息 ===\n"
-            result += f"最新价格: {latest_data['close_price']:.2f}\n"
-            result += f"开盘价: {latest_data['open_price']:.2f}\n"
-            result += f"最高价: {latest_data['high_price']:.2f}\n"
-            result += f"最低价: {latest_data['low_price']:.2f}\n"
-            result += f"成交量: {latest_data['volume']:,.0f}\n\n"
-            
-            # 技术指标
-            if indicators:
-                result += "=== 主要技术指标 ===\n"
-                latest_idx = -1
-                
-                if 'sma_20' in indicators and len(indicators['sma_20']) > 0:
-                    sma20 = indicators['sma_20'].iloc[latest_idx]
-                    result += f"SMA(20): {sma20:.2f}\n"
-                
-                if 'ema_12' in indicators and len(indicators['ema_12']) > 0:
-                    ema12 = indicators['ema_12'].iloc[latest_idx]
-                    result += f"EMA(12): {ema12:.2f}\n"
-                
-                if 'rsi' in indicators and len(indicators['rsi']) > 0:
-                    rsi = indicators['rsi'].iloc[latest_idx]
-                    result += f"RSI(14): {rsi:.2f}\n"
-                
-                if 'adx' in indicators and len(indicators['adx']) > 0:
-                    adx = indicators['adx'].iloc[latest_idx]
-                    result += f"ADX: {adx:.2f}\n"
-                
-                if 'trend_strength' in indicators and len(indicators['trend_strength']) > 0:
-                    trend_str = indicators['trend_strength'].iloc[latest_idx]
-                    result += f"趋势强度: {trend_str:.3f}\n\n"
-            
-            # 交易建议
-            if recommendation:
-                result += "=== 交易建议 ===\n"
-                result += f"建议: {recommendation.get('recommendation', 'N/A')}\n"
-                result += f"操作: {recommendation.get('action', 'N/A')}\n"
-                result += f"信号强度: {recommendation.get('signal_strength', 0):.3f}\n"
-                result += f"市场状态: {recommendation.get('market_regime', 'N/A')}\n\n"
-                
-                # 支撑阻力位
-                support_levels = recommendation.get('support_levels', [])
-                resistance_levels = recommendation.get('resistance_levels', [])
-                
-                if support_levels:
-                    result += "支撑位: " + ", ".join([f"{level:.2f}" for level in support_levels]) + "\n"
-                if resistance_levels:
-                    result += "阻力位: " + ", ".join([f"{level:.2f}" for level in resistance_levels]) + "\n"
-            
-            return result
-            
-        except Exception as e:
-            return f"综合技术分析失败: {e}"
+    def cache_analysis_result(self, cache_key: tuple, result: str):
+        """缓存分析结果，超出容量时淘汰最久未使用的条目"""
+        self._analysis_cache[cache_key] = result
+        self._analysis_cache.move_to_end(cache_key)
+        while len(self._analysis_cache) > self.ANALYSIS_CACHE_SIZE:
+            self._analysis_cache.popitem(last=False)
     
-    def wyckoff_analysis(self, data: pd.DataFrame, exchange: str, product: str) -> str:
-        """维科夫量价分析"""
+    def _run_analysis(self, exchange: str, product: str, analysis_type: str,
+                      start_date: str, end_date: str) -> Optional[str]:
+        """后台执行技术分析，返回格式化结果；失败时显示错误并返回None（不进入缓存）"""
         try:
-            result = f"=== {exchange}-{product} 维科夫量价分析 ===\n\n"
-            
-            # 计算维科夫指标
-            ad_line = tech_indicators.wyckoff_accumulation_distribution(
-                data['high_price'], data['low_price'], data['close_price'], data['volume']
-            )
-            pvt = tech_indicators.wyckoff_price_volume_trend(data['close_price'], data['volume'])
-            
-            # 成交量分析
-            volume_profile = tech_indicators.volume_profile(
-                data['high_price'], data['low_price'], data['close_price'], data['volume']
+            self.start_progress()
+            
+            # 获取数据
+            data = db_manager.get_continuous_contract_data(
+                exchange=exchange,
+                product_code=product,
+                contract_type='main',
+                start_date=start_date,
+                end_date=end_date,
+                columns=OHLCV_COLUMNS
             )
             
-            # 分析结果
-            latest_ad = ad_line.iloc[-1] if len(ad_line) > 0 else 0
-            latest_pvt = pvt.iloc[-1] if len(pvt) > 0 else 0
-            
-            result += f"累积/分布线(A/D): {latest_ad:.0f}\n"
-            result += f"价量趋势(PVT): {latest_pvt:.0f}\n\n"
+            if data.empty:
+                self.update_status("没有找到符合条件的数据")
+                return None
             
-            # 成交量分布分析
-            if volume_profile:
-                poc_price = volume_profile.get('poc_price', 0)
-                total_volume = volume_profile.get('total_volume', 0)
-                result += f"成交量集中价位(POC): {poc_price:.2f}\n"
-                result += f"总成交量: {total_volume:,.0f}\n\n"
-            
-            # 趋势判断
-            ad_trend = "上升" if latest_ad > ad_line.iloc[-10] else "下降"
-            pvt_trend = "上升" if latest_pvt > pvt.iloc[-10] else "下降"
-            
-            result += f"A/D线趋势: {ad_trend}\n"
-            result += f"PVT趋势: {pvt_trend}\n\n"
-            
-            # 维科夫信号
-            price_rising = data['close_price'].iloc[-1] > data['close_price'].iloc[-5]
-            ad_falling = latest_ad < ad_line.iloc[-5]
-            
-            if price_rising and ad_falling:
-                result += "⚠️ 警告: 价格上涨但A/D线下降，可能存在看跌背离\n"
-            elif not price_rising and latest_ad > ad_line.iloc[-5]:
-                result += "📈 机会: 价格下跌但A/D线上升，可能存在看涨背离\n"
-            else:
-                result += "📊 价格与A/D线趋势一致\n"
-            
-            return result
+            # 在进程池中执行分析，按列传递数组以减少序列化开销
+            columns = {col: data[col].to_numpy() for col in data.columns}
+            return self._cpu_pool.submit(run_analysis, analysis_type, columns, exchange, product).result()
             
         except Exception as e:
-            return f"维科夫分析失败: {e}"
+            self.update_status(f"分析执行失败: {e}")
+            self.root.after(0, self.display_analysis_result, str(e))
+            return None
+        finally:
+            self.stop_progress()
     
-    def trend_strength_analysis(self, data: pd.DataFrame, exchange: str, product: str) -> str:
-        """趋势强度分析"""
-        try:
-            result = f"=== {exchange}-{product} 趋势强度分析 ===\n\n"
-            
-            trend_strength = tech_indicators.trend_strength(data['close_price'])
-            adx_data = tech_indicators.adx(data['high_price'], data['low_price'], data['close_price'])
-            
-            latest_trend = trend_strength.iloc[-1] if len(trend_strength) > 0 else 0
-            latest_adx = adx_data['adx'].iloc[-1] if 'adx' in adx_data and len(adx_data['adx']) > 0 else 0
-            
-            result += f"趋势强度指标: {latest_trend:.3f}\n"
-            result += f"ADX指标: {latest_adx:.2f}\n\n"
-            
-            # 趋势评估
-            if latest_trend > 0.7:
-                trend_desc = "极强趋势"
-            elif latest_trend > 0.5:
-                trend_desc = "强趋势"
-            elif latest_trend > 0.3:
-                trend_desc = "中等趋势"
-            else:
-                trend_desc = "弱趋势或震荡"
-            
-            result += f"趋势评估: {trend_desc}\n"
-            
-            if latest_adx > 25:
-                adx_desc = "趋势强劲"
-            elif latest_adx > 20:
-                adx_desc = "趋势中等"
-            else:
-                adx_desc = "趋势较弱"
-            
-            result += f"ADX评估: {adx_desc}\n\n"
-            
-            # 交易建议
-            if latest_trend > 0.5 and latest_adx > 25:
-                result += "💡 建议: 适合趋势跟随策略\n"
-            elif latest_trend < 0.3 and latest_adx < 20:
-                result += "💡 建议: 适合震荡交易策略\n"
-            else:
-                result += "💡 建议: 谨慎观望，等待明确趋势\n"
-            
-            return result
-            
-        except Exception as e:
-            return f"趋势强度分析失败: {e}"
+    def display_analysis_result(self, result: str):
+        """显示分析结果"""
+        self.replace_text(self.analysis_result_text, result)
+    
+    def generate_trading_signals(self):
+        """生成交易信号"""
+        exchange = self.analysis_exchange_var.get()
+        product = self.analysis_product_var.get()
+        
+        if not all([exchange, product]):
+            self.update_status("请选择交易所和品种")
+            return
+        
+        self.submit_task('analysis', self._run_signal_generation, self.display_analysis_result,
+                         exchange, product)
     
-    def sideways_analysis(self, data: pd.DataFrame, exchange: str, product: str) -> str:
-        """震荡识别分析"""
+    def _run_signal_generation(self, exchange: str, product: str) -> Optional[str]:
+        """后台生成交易信号，返回格式化结果"""
         try:
-            result = f"=== {exchange}-{product} 震荡识别分析 ===\n\n"
-            
-            sideways = tech_indicators.sideways_market_detection(
-                data['high_price'], data['low_price'], data['close_price']
+            self.start_progress()
+            
+            # 获取数据
+            end_date = datetime.now().strftime('%Y-%m-%d')
+            start_date = (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
+            
+            data = db_manager.get_continuous_contract_data(
+                exchange=exchange,
+                product_code=product,
+                contract_type='main',
+                start_date=start_date,
+                end_date=end_date,
+                columns=OHLCV_COLUMNS
             )
             
-            breakout_data = tech_indicators.breakout_potential(
-                data['high_price'], data['low_price'], data['close_price'], data['volume']
-            )
+            if data.empty:
+                self.update_status("没有找到符合条件的数据")
+                return None
             
-            # 当前状态
-            is_sideways = sideways.iloc[-1] if len(sideways) > 0 else 0
+            # 重命名列
+            signal_data = to_ohlc(data)
             
-            if is_sideways:
-                result += "📊 当前状态: 震荡市场\n\n"
+            # 生成信号
+            signal_result = signal_generator.comprehensive_signal(signal_data)
+            
+            # 格式化结果
+            parts = [f"=== {exchange}-{product} 交易信号分析 ===\n\n"]
+            parts.append(f"信号生成时间: {_fmt_now()}\n\n")
+            
+            if signal_result:
+                final_signals = signal_result['final_signal']
+                signal_stats = signal_result['signal_stats']
                 
-                # 震荡区间
-                recent_data = data.tail(20)
-                support_level = recent_data['low_price'].min()
-                resistance_level = recent_data['high_price'].max()
+                # 最新信号
+                latest_signal = final_signals.iloc[-1] if len(final_signals) > 0 else 0
+                latest_strength = signal_result['weighted_signal'].iloc[-1] if len(signal_result['weighted_signal']) > 0 else 0
                 
-                result += f"震荡区间:\n"
-                result += f"  支撑位: {support_level:.2f}\n"
-                result += f"  阻力位: {resistance_level:.2f}\n"
-                result += f"  区间幅度: {(resistance_level - support_level) / support_level * 100:.2f}%\n\n"
+                parts.append(f"当前信号: {SIGNAL_DESC.get(latest_signal, '未知')}\n")
+                parts.append(f"信号强度: {latest_strength:.3f}\n\n")
                 
-                # 突破潜力分析
-                if 'bb_squeeze' in breakout_data:
-                    bb_squeeze = breakout_data['bb_squeeze'].iloc[-1]
-                    volume_spike = breakout_data['volume_spike'].iloc[-1]
-                    
-                    if bb_squeeze:
-                        result += "⚠️ 布林带收缩，可能即将突破\n"
-                    if volume_spike:
-                        result += "📈 成交量异常放大\n"
-                    
-                    if bb_squeeze and volume_spike:
-                        result += "💥 高突破概率！建议关注方向选择\n"
+                # 信号统计
+                parts.append("=== 信号统计 ===\n")
+                parts.append(f"总信号数: {signal_stats['total_signals']}\n")
+                parts.append(f"买入信号: {signal_stats['buy_signals']}\n")
+                parts.append(f"卖出信号: {signal_stats['sell_signals']}\n")
+                parts.append(f"强烈买入: {signal_stats['strong_buy']}\n")
+                parts.append(f"强烈卖出: {signal_stats['strong_sell']}\n\n")
                 
-            else:
-                result += "📈 当前状态: 趋势市场\n"
+                # 各个子信号
+                individual_signals = signal_result['individual_signals']
+                parts.append("=== 各指标信号 ===\n")
                 
-                # 趋势方向
-                price_change = (data['close_price'].iloc[-1] - data['close_price'].iloc[-20]) / data['close_price'].iloc[-20]
-                direction = "上涨" if price_change > 0 else "下跌"
-                result += f"趋势方向: {direction}\n"
-                result += f"20日涨跌幅: {price_change * 100:.2f}%\n"
+                for signal_key, signal_series in individual_signals.items():
+                    if len(signal_series) > 0:
+                        latest_individual = signal_series.iloc[-1]
+                        signal_name = SIGNAL_NAMES.get(signal_key, signal_key)
+                        parts.append(f"{signal_name}: {SIGNAL_DESC.get(latest_individual, '观望')}\n")
             
-            return result
+            return "".join(parts)
             
         except Exception as e:
-            return f"震荡识别分析失败: {e}"
+            self.update_status(f"信号生成失败: {e}")
+            return None
+        finally:
+            self.stop_progress()
+    
+    def start_backtest(self):
+        """开始回测"""
+        exchange = self.backtest_exchange_var.get()
+        product = self.backtest_product_var.get()
+        
+        if not all([exchange, product]):
+            self.update_status("请选择回测品种")
+            return
+        
+        # 回测参数已在编辑时校验解析
+        if self._invalid_params:
+            self.update_status("回测参数无效，请修正标红的输入框")
+            return
+        start_date = self.backtest_start_date.get()
+        end_date = self.backtest_end_date.get()
+        
+        # 回测进度通过队列流式显示，结果出来后整体替换
+        # 进度队列同时作为本次回测的标识，旧回测的进度和报告不再显示
+        progress_queue = queue.Queue()
+        self._backtest_run = progress_queue
+        self._backtest_report_started = False
+        self.replace_text(self.backtest_result_text, f"=== {exchange}-{product} 回测进行中 ===\n")
+        future = self.submit_task('backtest', self._run_backtest, None,
+                                  exchange, product, self._initial_capital, self._commission,
+                                  self._position_size,
+                                  start_date, end_date, progress_queue)
+        self.root.after(200, self._drain_backtest_progress, progress_queue, future)
     
-    def support_resistance_analysis(self, data: pd.DataFrame, exchange: str, product: str) -> str:
-        """支撑阻力分析"""
+    def _run_backtest(self, exchange: str, product: str, initial_capital: float,
+                      commission: float, position_size: float,
+                      start_date: str, end_date: str,
+                      progress_queue: Optional[queue.Queue] = None) -> None:
+        """后台执行回测，报告按段落逐段推送到界面显示"""
         try:
-            result = f"=== {exchange}-{product} 支撑阻力分析 ===\n\n"
-            
-            sr_levels = tech_indicators.support_resistance_levels(
-                data['high_price'], data['low_price'], data['close_price']
+            self.start_progress()
+            
+            # 获取数据
+            data = db_manager.get_continuous_contract_data(
+                exchange=exchange,
+                product_code=product,
+                contract_type='main',
+                start_date=start_date,
+                end_date=end_date,
+                columns=OHLCV_COLUMNS
             )
             
-            current_price = data['close_price'].iloc[-1]
-            result += f"当前价格: {current_price:.2f}\n\n"
-            
-            # 支撑位分析
-            support_levels = sr_levels.get('support_levels', [])
-            if support_levels:
-                result += "📉 主要支撑位:\n"
-                for i, level in enumerate(support_levels[:5]):
-                    distance = (current_price - level) / current_price * 100
-                    result += f"  支撑{i+1}: {level:.2f} (距离: {distance:.2f}%)\n"
-                result += "\n"
+            if data.empty:
+                self.update_status("没有找到回测数据")
+                self.root.after(0, self.display_backtest_result, progress_queue, "没有找到回测数据\n", True)
+                return
             
-            # 阻力位分析
-            resistance_levels = sr_levels.get('resistance_levels', [])
-            if resistance_levels:
-                result += "📈 主要阻力位:\n"
-                for i, level in enumerate(resistance_levels[:5]):
-                    distance = (level - current_price) / current_price * 100
-                    result += f"  阻力{i+1}: {level:.2f} (距离: {distance:.2f}%)\n"
-                result += "\n"
+            # 重命名列，以交易日期为索引便于进度显示
+            backtest_data = to_ohlc(data).set_index('trade_date')
             
-            # 关键位分析
-            nearest_support = max([level for level in support_levels if level < current_price], default=0)
-            nearest_resistance = min([level for level in resistance_levels if level > current_price], default=float('inf'))
-            
-            if nearest_support > 0:
-                support_distance = (current_price - nearest_support) / current_price * 100
-                result += f"🔻 最近支撑位: {nearest_support:.2f} (距离: {support_distance:.2f}%)\n"
-            
-            if nearest_resistance < float('inf'):
-                resistance_distance = (nearest_resistance - current_price) / current_price * 100
-                result += f"🔺 最近阻力位: {nearest_resistance:.2f} (距离: {resistance_distance:.2f}%)\n"
+            # 创建回测引擎
+            from backtest_engine import BacktestEngine
+            engine = BacktestEngine(
+                initial_capital=initial_capital,
+                commission=commission,
+                position_size_pct=position_size
+            )
             
-            # 交易建议
-            result += "\n💡 交易建议:\n"
-            if nearest_support > 0 and support_distance < 2:
-                result += "- 接近支撑位，关注反弹机会\n"
-            if nearest_resistance < float('inf') and resistance_distance < 2:
-                result += "- 接近阻力位，注意回调风险\n"
+            # 运行回测
+            symbol = f"{exchange}-{product}"
+            report = engine.run_backtest(backtest_data, symbol, progress_queue=progress_queue)
             
-            return result
+            # 逐段格式化并显示，首段先到先显示
+            for index, chunk in enumerate(self.format_backtest_result(report, exchange, product)):
+                self.root.after(0, self.display_backtest_result, progress_queue, chunk, index == 0)
             
         except Exception as e:
-            return f"支撑阻力分析失败: {e}"
-    
-    def display_analysis_result(self, result: str):
-        """显示分析结果"""
-        self.analysis_result_text.delete(1.0, tk.END)
-        self.analysis_result_text.insert(1.0, result)
-    
-    def generate_trading_signals(self):
-        """生成交易信号"""
-        def signal_thread():
-            try:
-                self.start_progress()
-                
-                exchange = self.analysis_exchange_var.get()
-                product = self.analysis_product_var.get()
-                
-                if not all([exchange, product]):
-                    self.update_status("请选择交易所和品种")
-                    return
-                
-                # 获取数据
-                end_date = datetime.now().strftime('%Y-%m-%d')
-                start_date = (datetime.now() - timedelta(days=90)).strftime('%Y-%m-%d')
-                
-                data = db_manager.get_continuous_contract_data(
-                    exchange=exchange,
-                    product_code=product,
-                    contract_type='main',
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                if data.empty:
-                    self.update_status("没有找到符合条件的数据")
-                    return
-                
-                # 重命名列
-                signal_data = data.rename(columns={
-                    'open_price': 'open',
-                    'high_price': 'high',
-                    'low_price': 'low',
-                    'close_price': 'close'
-                })
-                
-                # 生成信号
-                signal_result = signal_generator.comprehensive_signal(signal_data)
-                
-                # 格式化结果
-                result = f"=== {exchange}-{product} 交易信号分析 ===\n\n"
-                result += f"信号生成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-                
-                if signal_result:
-                    final_signals = signal_result['final_signal']
-                    signal_stats = signal_result['signal_stats']
-                    
-                    # 最新信号
-                    latest_signal = final_signals.iloc[-1] if len(final_signals) > 0 else 0
-                    latest_strength = signal_result['weighted_signal'].iloc[-1] if len(signal_result['weighted_signal']) > 0 else 0
-                    
-                    signal_desc = {
-                        2: "强烈买入",
-                        1: "买入",
-                        0: "观望",
-                        -1: "卖出",
-                        -2: "强烈卖出"
-                    }
-                    
-                    result += f"当前信号: {signal_desc.get(latest_signal, '未知')}\n"
-                    result += f"信号强度: {latest_strength:.3f}\n\n"
-                    
-                    # 信号统计
-                    result += "=== 信号统计 ===\n"
-                    result += f"总信号数: {signal_stats['total_signals']}\n"
-                    result += f"买入信号: {signal_stats['buy_signals']}\n"
-                    result += f"卖出信号: {signal_stats['sell_signals']}\n"
-                    result += f"强烈买入: {signal_stats['strong_buy']}\n"
-                    result += f"强烈卖出: {signal_stats['strong_sell']}\n\n"
-                    
-                    # 各个子信号
-                    individual_signals = signal_result['individual_signals']
-                    result += "=== 各指标信号 ===\n"
-                    
-                    signal_names = {
-                        'ma_crossover': '均线交叉',
-                        'macd': 'MACD',
-                        'rsi': 'RSI',
-                        'bollinger': '布林带',
-                        'wyckoff': '维科夫',
-                        'support_resistance': '支撑阻力',
-                        'trend_following': '趋势跟随',
-                        'breakout': '突破'
-                    }
-                    
-                    for signal_key, signal_series in individual_signals.items():
-                        if len(signal_series) > 0:
-                            latest_individual = signal_series.iloc[-1]
-                            signal_name = signal_names.get(signal_key, signal_key)
-                            result += f"{signal_name}: {signal_desc.get(latest_individual, '观望')}\n"
-                
-                # 在主线程中更新结果
-                self.root.after(0, lambda: self.display_analysis_result(result))
-                
-            except Exception as e:
-                self.update_status(f"信号生成失败: {e}")
-            finally:
-                self.stop_progress()
-        
-        threading.Thread(target=signal_thread, daemon=True).start()
-    
-    def start_backtest(self):
-        """开始回测"""
-        def backtest_thread():
-            try:
-                self.start_progress()
-                
-                exchange = self.backtest_exchange_var.get()
-                product = self.backtest_product_var.get()
-                
-                if not all([exchange, product]):
-                    self.update_status("请选择回测品种")
-                    return
-                
-                # 获取回测参数
-                initial_capital = float(self.initial_capital_var.get())
-                commission = float(self.commission_var.get())
-                position_size = float(self.position_size_var.get())
-                start_date = self.backtest_start_date.get()
-                end_date = self.backtest_end_date.get()
-                
-                # 获取数据
-                data = db_manager.get_continuous_contract_data(
-                    exchange=exchange,
-                    product_code=product,
-                    contract_type='main',
-                    start_date=start_date,
-                    end_date=end_date
-                )
-                
-                if data.empty:
-                    self.update_status("没有找到回测数据")
-                    return
-                
-                # 重命名列
-                backtest_data = data.rename(columns={
-                    'open_price': 'open',
-                    'high_price': 'high',
-                    'low_price': 'low',
-                    'close_price': 'close'
-                })
-                
-                # 创建回测引擎
-                from backtest_engine import BacktestEngine
-                engine = BacktestEngine(
-                    initial_capital=initial_capital,
-                    commission=commission,
-                    position_size_pct=position_size
-                )
-                
-                # 运行回测
-                symbol = f"{exchange}-{product}"
-                report = engine.run_backtest(backtest_data, symbol)
-                
-                # 格式化结果
-                result = self.format_backtest_result(report, exchange, product)
-                
-                # 在主线程中更新结果
-                self.root.after(0, lambda: self.display_backtest_result(result))
-                
-            except Exception as e:
-                self.update_status(f"回测执行失败: {e}")
-            finally:
-                self.stop_progress()
-        
-        threading.Thread(target=backtest_thread, daemon=True).start()
+            self.update_status(f"回测执行失败: {e}")
+            # 替换"回测进行中"标题和已显示的进度
+            self.root.after(0, self.display_backtest_result, progress_queue, f"回测执行失败: {e}\n", True)
+        finally:
+            self.stop_progress()
     
-    def format_backtest_result(self, report: dict, exchange: str, product: str) -> str:
-        """格式化回测结果"""
+    def format_backtest_result(self, report: dict, exchange: str, product: str) -> Iterator[str]:
+        """格式化回测结果，按段落逐段生成"""
         if not report:
-            return "回测失败，无结果数据"
+            yield "回测失败，无结果数据"
+            return
         
         summary = report.get('summary', {})
         
-        result = f"=== {exchange}-{product} 回测报告 ===\n\n"
-        result += f"回测完成时间: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
-        
-        result += "=== 资金表现 ===\n"
-        result += f"初始资金: {summary.get('initial_capital', 0):,.2f}\n"
-        result += f"最终资金: {summary.get('final_capital', 0):,.2f}\n"
-        result += f"总收益率: {summary.get('total_return', 0):.2%}\n"
-        result += f"年化收益率: {summary.get('annual_return', 0):.2%}\n"
-        result += f"波动率: {summary.get('volatility', 0):.2%}\n"
-        result += f"夏普比率: {summary.get('sharpe_ratio', 0):.3f}\n"
-        result += f"最大回撤: {summary.get('max_drawdown', 0):.2%}\n\n"
-        
-        result += "=== 交易统计 ===\n"
-        result += f"总交易次数: {summary.get('total_trades', 0)}\n"
-        result += f"盈利次数: {summary.get('winning_trades', 0)}\n"
-        result += f"亏损次数: {summary.get('losing_trades', 0)}\n"
-        result += f"胜率: {summary.get('win_rate', 0):.2%}\n"
-        result += f"盈亏比: {summary.get('profit_factor', 0):.3f}\n"
-        result += f"平均盈利: {summary.get('avg_win', 0):.2f}\n"
-        result += f"平均亏损: {summary.get('avg_loss', 0):.2f}\n\n"
-        
-        # 策略评估
-        total_return = summary.get('total_return', 0)
-        sharpe_ratio = summary.get('sharpe_ratio', 0)
-        max_drawdown = summary.get('max_drawdown', 0)
-        win_rate = summary.get('win_rate', 0)
-        
-        result += "=== 策略评估 ===\n"
-        
-        if total_return > 0.1:
-            result += "✅ 收益表现: 优秀\n"
-        elif total_return > 0.05:
-            result += "🔶 收益表现: 良好\n"
-        else:
-            result += "❌ 收益表现: 不佳\n"
-        
-        if sharpe_ratio > 1.5:
-            result += "✅ 风险调整收益: 优秀\n"
-        elif sharpe_ratio > 1.0:
-            result += "🔶 风险调整收益: 良好\n"
-        else:
-            result += "❌ 风险调整收益: 不佳\n"
-        
-        if max_drawdown < 0.1:
-            result += "✅ 回撤控制: 优秀\n"
-        elif max_drawdown < 0.2:
-            result += "🔶 回撤控制: 良好\n"
-        else:
-            result += "❌ 回撤控制: 不佳\n"
-        
-        if win_rate > 0.5:
-            result += "✅ 胜率: 优秀\n"
-        elif win_rate > 0.4:
-            result += "🔶 胜率: 良好\n"
-        else:
-            result += "❌ 胜率: 不佳\n"
+        # 浮点数统一精度后转为不可变元组作为缓存键
+        summary_items = tuple(sorted(
+            (key, round(value, 6) if isinstance(value, float) else value)
+            for key, value in summary.items()
+        ))
         
-        return result
+        yield f"=== {exchange}-{product} 回测报告 ===\n\n回测完成时间: {_fmt_now()}\n\n"
+        yield from _format_report_cached(summary_items)
     
-    def display_backtest_result(self, result: str):
-        """显示回测结果"""
-        self.backtest_result_text.delete(1.0, tk.END)
-        self.backtest_result_text.insert(1.0, result)
+    def display_backtest_result(self, progress_queue: queue.Queue, chunk: str, first: bool):
+        """追加显示一段回测报告，首段清空进度内容"""
+        if progress_queue is not self._backtest_run:
+            return
+        
+        widget = self.backtest_result_text
+        widget.config(state=tk.NORMAL)
+        if first:
+            self._backtest_report_started = True
+            widget.delete(1.0, tk.END)
+        widget.insert(tk.END, chunk)
+        widget.mark_set(tk.INSERT, 1.0)
+        widget.see(1.0)
+        widget.config(state=tk.DISABLED)
+    
+    def _drain_backtest_progress(self, progress_queue: queue.Queue, future):
+        """取出所有待显示的回测进度，一次插入文本框"""
+        # 回测已结束、报告已开始显示或被新回测取代时停止
+        if future.done() or self._backtest_report_started or progress_queue is not self._backtest_run:
+            return
+        
+        lines = []
+        while True:
+            try:
+                date, equity = progress_queue.get_nowait()
+            except queue.Empty:
+                break
+            lines.append(f"{date:%Y-%m-%d}  组合价值: {equity:,.2f}\n")
+        
+        if lines:
+            widget = self.backtest_result_text
+            widget.config(state=tk.NORMAL)
+            widget.insert(tk.END, "".join(lines))
+            widget.see(tk.END)
+            widget.config(state=tk.DISABLED)
+        
+        self.root.after(200, self._drain_backtest_progress, progress_queue, future)
     
     def connect_trading_system(self):
         """连接交易系统"""
@@ -1575,7 +1549,7 @@ class FuturesDataGUI:
     
     def disconnect_trading_system(self):
         """断开交易系统连接"""
-        # 这里应该调用断开连接的方法
+        live_trading_manager.disconnect_from_trading_system()
         self.trading_status_label.config(text="状态: 未连接")
         self.update_status("已断开交易系统连接")
     
@@ -1592,8 +1566,57 @@ class FuturesDataGUI:
         live_trading_manager.stop_live_trading()
         self.update_status("自动交易已停止")
     
+    def on_trading_status_changed(self, event: str):
+        """交易状态变化回调（可能在非主线程调用），事件入队后在主线程合并处理"""
+        self._trading_events.put(event)
+        if not self._trading_drain_scheduled:
+            self._trading_drain_scheduled = True
+            self.root.after(self.TRADING_EVENT_DEBOUNCE_MS, self._drain_trading_events)
+    
+    def _drain_trading_events(self):
+        """取出所有待处理的交易事件，合并为一次界面刷新"""
+        self._trading_drain_scheduled = False
+        changed = False
+        while True:
+            try:
+                self._trading_events.get_nowait()
+            except queue.Empty:
+                break
+            changed = True
+        
+        if not changed:
+            return
+        
+        # 交易页不可见时只做标记，切换到该页或窗口恢复时再刷新
+        if self.is_trading_status_visible():
+            self.update_trading_status()
+        else:
+            self._trading_status_stale = True
+    
+    def is_trading_status_visible(self) -> bool:
+        """交易页是否当前可见（选中该页且窗口未最小化）"""
+        return (self.notebook.select() == str(self.live_trading_frame)
+                and self.root.state() != 'iconic')
+    
+    def on_window_restored(self, event):
+        """窗口从最小化恢复时，刷新期间积压的交易状态"""
+        if event.widget is self.root and self._trading_status_stale and self.is_trading_status_visible():
+            self.update_trading_status()
+    
+    def _idle_refresh_trading_status(self):
+        """低频兜底刷新交易状态，交易页不可见时跳过查询"""
+        if self.is_trading_status_visible():
+            self.update_trading_status()
+        self.root.after(self.TRADING_IDLE_REFRESH_MS, self._idle_refresh_trading_status)
+    
     def update_trading_status(self):
-        """更新交易状态"""
+        """更新交易状态（后台线程查询并生成文本，主线程只负责显示）"""
+        self._trading_status_stale = False
+        self._status_generation += 1
+        self._io_executor.submit(self._build_status_text, self._status_generation)
+    
+    def _build_status_text(self, generation: int):
+        """后台线程：获取交易状态并生成显示文本"""
         try:
             status = live_trading_manager.get_trading_status()
             
@@ -1616,15 +1639,38 @@ class FuturesDataGUI:
             else:
                 status_text += "=== 持仓信息 ===\n无持仓\n"
             
-            # 更新显示
-            self.trading_status_text.delete(1.0, tk.END)
-            self.trading_status_text.insert(1.0, status_text)
+            self.root.after(0, self._apply_status_text, generation, status_text)
             
         except Exception as e:
             self.logger.error(f"更新交易状态失败: {e}")
+    
+    def _apply_status_text(self, generation: int, status_text: str):
+        """主线程：显示交易状态文本，过期的刷新结果直接丢弃"""
+        if generation != self._status_generation:
+            return
+        # 内容未变化时不触碰文本框
+        if status_text == self._last_status_text:
+            return
+        
+        widget = self.trading_status_text
+        old_sections = STATUS_SECTION_PATTERN.split(self._last_status_text)
+        new_sections = STATUS_SECTION_PATTERN.split(status_text)
+        
+        if self._last_status_text and len(old_sections) == len(new_sections):
+            # 分段结构相同时只替换变化的段落
+            widget.config(state=tk.NORMAL)
+            line = 1
+            for old_section, new_section in zip(old_sections, new_sections):
+                if old_section != new_section:
+                    end_line = line + old_section.count("\n")
+                    widget.delete(f"{line}.0", f"{end_line}.0")
+                    widget.insert(f"{line}.0", new_section)
+                line += new_section.count("\n")
+            widget.config(state=tk.DISABLED)
+        else:
+            self.replace_text(widget, status_text)
         
-        # 每5秒更新一次
-        self.root.after(5000, self.update_trading_status)
+        self._last_status_text = status_text
     
     def upload_single_file(self):
         """上传单个文件"""
@@ -1651,36 +1697,37 @@ class FuturesDataGUI:
             ttk.Label(dialog, text="交易所:").pack(pady=5)
             exchange_var = tk.StringVar()
             exchange_combo = ttk.Combobox(dialog, textvariable=exchange_var, 
-                                        values=list(EXCHANGES.keys()), width=27)
+                                        values=EXCHANGE_KEYS, width=27)
             exchange_combo.pack(pady=5)
             
             def do_upload():
-                symbol = symbol_var.get()
+                # 在主线程中一次性读取输入，后台线程只使用这些值
+                symbol = symbol_var.get().strip()
                 exchange = exchange_var.get()
                 
                 if not symbol or not exchange:
                     messagebox.showerror("错误", "请填写完整信息")
                     return
                 
-                def upload_thread():
+                def upload_thread(symbol: str, exchange: str):
                     try:
                         self.start_progress()
                         result = data_uploader.upload_file(file_path, symbol, exchange)
                         
                         if result['success']:
                             self.update_status(f"文件上传成功: {result['message']}")
-                            self.root.after(0, self.update_data_summary)
+                            self.root.after(0, self._on_data_changed)
                         else:
                             self.update_status(f"文件上传失败: {result['message']}")
                         
-                        dialog.destroy()
+                        self.root.after(0, dialog.destroy)
                         
                     except Exception as e:
                         self.update_status(f"文件上传失败: {e}")
                     finally:
                         self.stop_progress()
                 
-                threading.Thread(target=upload_thread, daemon=True).start()
+                self._io_executor.submit(upload_thread, symbol, exchange)
             
             ttk.Button(dialog, text="开始上传", command=do_upload).pack(pady=20)
     
@@ -1697,13 +1744,14 @@ class FuturesDataGUI:
             ttk.Label(dialog, text="默认交易所:").pack(pady=10)
             exchange_var = tk.StringVar()
             exchange_combo = ttk.Combobox(dialog, textvariable=exchange_var,
-                                        values=list(EXCHANGES.keys()), width=20)
+                                        values=EXCHANGE_KEYS, width=20)
             exchange_combo.pack(pady=5)
             
             def do_batch_upload():
+                # 在主线程中读取输入，后台线程只使用该值
                 exchange = exchange_var.get()
                 
-                def upload_thread():
+                def upload_thread(exchange: str):
                     try:
                         self.start_progress()
                         result = data_uploader.batch_upload_directory(directory, exchange)
@@ -1712,16 +1760,16 @@ class FuturesDataGUI:
                         message = summary.get('message', '批量上传完成')
                         
                         self.update_status(f"批量上传完成: {message}")
-                        self.root.after(0, self.update_data_summary)
+                        self.root.after(0, self._on_data_changed)
                         
-                        dialog.destroy()
+                        self.root.after(0, dialog.destroy)
                         
                     except Exception as e:
                         self.update_status(f"批量上传失败: {e}")
                     finally:
                         self.stop_progress()
                 
-                threading.Thread(target=upload_thread, daemon=True).start()
+                self._io_executor.submit(upload_thread, exchange)
             
             ttk.Button(dialog, text="开始上传", command=do_batch_upload).pack(pady=20)
     
@@ -1742,14 +1790,14 @@ class FuturesDataGUI:
                     message = summary.get('message', 'ZIP文件上传完成')
                     
                     self.update_status(f"ZIP上传完成: {message}")
-                    self.root.after(0, self.update_data_summary)
+                    self.root.after(0, self._on_data_changed)
                     
                 except Exception as e:
                     self.update_status(f"ZIP上传失败: {e}")
                 finally:
                     self.stop_progress()
             
-            threading.Thread(target=upload_thread, daemon=True).start()
+            self._io_executor.submit(upload_thread)
     
     def run(self):
         """运行程序"""
@@ -1757,6 +1805,10 @@ class FuturesDataGUI:
             self.root.mainloop()
         finally:
             # 清理资源
+            self._executor.shutdown(wait=False)
+            self._io_executor.shutdown(wait=False, cancel_futures=True)
+            self._cpu_pool.shutdown(wait=False, cancel_futures=True)
+            signal_generator.shutdown()
             data_manager.stop_scheduled_updates()
             db_manager.close_all_connections()
 
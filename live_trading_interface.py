@@ -3,13 +3,21 @@
 为连接实盘交易系统预留接口和框架
 """
 import logging
+import sys
+import threading
+import weakref
 from abc import ABC, abstractmethod
-from typing import Dict, List, Optional, Any
+from typing import Callable, Dict, List, Optional, Any, Tuple
 from datetime import datetime
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass
+from collections import OrderedDict
 
-@dataclass
+# Python 3.10+ 的数据类使用__slots__，减少内存占用并加快属性访问
+DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
+
+@dataclass(**DATACLASS_OPTIONS)
 class Order:
     """订单类"""
     order_id: str
@@ -25,7 +33,7 @@ class Order:
     commission: float = 0.0
     timestamp: Optional[datetime] = None
     
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Position:
     """持仓类"""
     symbol: str
@@ -35,7 +43,7 @@ class Position:
     unrealized_pnl: float
     realized_pnl: float = 0.0
     
-@dataclass
+@dataclass(**DATACLASS_OPTIONS)
 class Account:
     """账户信息类"""
     account_id: str
@@ -45,6 +53,22 @@ class Account:
     margin_used: float
     margin_available: float
 
+def _buy_fill(balance: float, pos_quantity: float, pos_avg_price: float,
+              quantity: float, price: float, commission: float) -> Tuple[float, float, float]:
+    """买入成交计算，返回(新资金, 新持仓数量, 新持仓均价)"""
+    new_balance = balance - (quantity * price + commission)
+    total_quantity = pos_quantity + quantity
+    total_cost = pos_quantity * pos_avg_price + quantity * price
+    new_avg_price = total_cost / total_quantity if total_quantity > 0 else price
+    return new_balance, total_quantity, new_avg_price
+
+def _sell_fill(balance: float, pos_quantity: float, pos_avg_price: float,
+               quantity: float, price: float, commission: float) -> Tuple[float, float, float]:
+    """卖出成交计算，返回(新资金, 剩余持仓数量, 实现盈亏)"""
+    new_balance = balance + (quantity * price - commission)
+    realized_pnl = (price - pos_avg_price) * quantity
+    return new_balance, pos_quantity - quantity, realized_pnl
+
 class BaseTradingInterface(ABC):
     """交易接口基类"""
     
@@ -73,11 +97,20 @@ class BaseTradingInterface(ABC):
         """获取持仓信息"""
         pass
     
+    @abstractmethod
+    def get_position(self, symbol: str) -> Optional[Position]:
+        """获取指定品种的持仓，无持仓返回None"""
+        pass
+    
     @abstractmethod
     def place_order(self, order: Order) -> str:
         """下单"""
         pass
     
+    def place_orders(self, orders: List[Order]) -> List[str]:
+        """批量下单，返回与orders一一对应的订单ID（失败为空字符串）"""
+        return [self.place_order(order) for order in orders]
+    
     @abstractmethod
     def cancel_order(self, order_id: str) -> bool:
         """撤单"""
@@ -92,6 +125,104 @@ class BaseTradingInterface(ABC):
     def get_market_data(self, symbol: str) -> Dict[str, Any]:
         """获取市场数据"""
         pass
+    
+    def get_market_data_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """批量获取市场数据，返回品种 -> 市场数据（默认逐个调用get_market_data，支持批量行情的接口可覆盖）"""
+        return {symbol: self.get_market_data(symbol) for symbol in symbols}
+
+class _OrderTable:
+    """按列存储的订单表，用于成交统计等批量查询（订单对象仍保存在orders字典中）
+    
+    移除的订单先只从rows中删除，数组写满时再压缩掉这些行，因此占用随保留的订单数而不是历史订单总数增长
+    """
+    
+    STATUS_CODES = {'PENDING': 0, 'FILLED': 1, 'CANCELLED': 2, 'REJECTED': 3}
+    DIRECTION_CODES = {'BUY': 1, 'SELL': -1}
+    COLUMNS = {
+        'symbol_id': np.int32,
+        'direction': np.int8,
+        'status': np.int8,
+        'quantity': np.float64,
+        'filled': np.float64,
+        'price': np.float64,
+        'avg_fill_price': np.float64,
+        'commission': np.float64,
+        'timestamp_ns': np.int64
+    }
+    
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        self.rows = {}  # 订单ID -> 行号（按追加顺序）
+        self.symbol_ids = {}  # 品种 -> 品种编号
+        self._allocate(capacity)
+    
+    def _allocate(self, capacity: int):
+        """分配（或扩容）各列数组"""
+        for name, dtype in self.COLUMNS.items():
+            column = np.zeros(capacity, dtype=dtype)
+            if self.size:
+                column[:self.size] = getattr(self, name)[:self.size]
+            setattr(self, name, column)
+        self.capacity = capacity
+    
+    def remove(self, order_id: str):
+        """移除订单记录（对应的行在下次压缩时释放）"""
+        self.rows.pop(order_id, None)
+    
+    def _compact(self):
+        """把仍保留的行按原顺序移到数组开头"""
+        live = np.fromiter(self.rows.values(), dtype=np.int64, count=len(self.rows))
+        for name in self.COLUMNS:
+            column = getattr(self, name)
+            column[:len(live)] = column[live]
+        self.rows = dict(zip(self.rows, range(len(live))))
+        self.size = len(live)
+    
+    def append(self, order: Order):
+        """追加一行订单记录"""
+        if self.size == self.capacity:
+            # 已移除的行过半时原地压缩，否则扩容
+            if len(self.rows) <= self.capacity // 2:
+                self._compact()
+            else:
+                self._allocate(self.capacity * 2)
+        
+        row = self.size
+        self.rows[order.order_id] = row
+        self.symbol_id[row] = self.symbol_ids.setdefault(order.symbol, len(self.symbol_ids))
+        self.direction[row] = self.DIRECTION_CODES.get(order.direction, 0)
+        self.status[row] = self.STATUS_CODES.get(order.status, 0)
+        self.quantity[row] = order.quantity
+        self.filled[row] = order.filled_quantity
+        self.price[row] = order.price if order.price is not None else np.nan
+        self.avg_fill_price[row] = order.avg_fill_price if order.avg_fill_price is not None else np.nan
+        self.commission[row] = order.commission
+        self.timestamp_ns[row] = int(order.timestamp.timestamp() * 1e9) if order.timestamp else 0
+        self.size += 1
+    
+    def set_status(self, order_id: str, status: str):
+        """更新订单状态"""
+        row = self.rows.get(order_id)
+        if row is not None:
+            self.status[row] = self.STATUS_CODES.get(status, 0)
+    
+    def statistics(self) -> Dict[str, Any]:
+        """订单汇总统计（只统计仍保留的订单）"""
+        if len(self.rows) < self.size:
+            self._compact()
+        n = self.size
+        filled = self.status[:n] == self.STATUS_CODES['FILLED']
+        direction = self.direction[:n]
+        turnover = self.filled[:n] * np.nan_to_num(self.avg_fill_price[:n])
+        return {
+            'total_orders': n,
+            'filled_orders': int(filled.sum()),
+            'cancelled_orders': int((self.status[:n] == self.STATUS_CODES['CANCELLED']).sum()),
+            'total_commission': float(self.commission[:n].sum()),
+            'buy_quantity': float(self.filled[:n][filled & (direction > 0)].sum()),
+            'sell_quantity': float(self.filled[:n][filled & (direction < 0)].sum()),
+            'turnover': float(turnover[filled].sum())
+        }
 
 class SimulatedTradingInterface(BaseTradingInterface):
     """模拟交易接口"""
@@ -101,8 +232,14 @@ class SimulatedTradingInterface(BaseTradingInterface):
         self.initial_balance = initial_balance
         self.balance = initial_balance
         self.positions = {}
-        self.orders = {}
+        self.orders = OrderedDict()  # 只保留最近max_orders笔订单
+        self.max_orders = 100000
+        self._orders_evicted = False
+        self.order_table = _OrderTable()  # 订单列式副本，供批量统计
         self.order_counter = 0
+        self._total_position_value = 0.0  # 持仓市值合计，随持仓变化增量维护
+        self._dirty = True  # 资金或持仓变化后需重新计算账户信息
+        self.account_version = 0  # 账户状态版本号，资金或持仓每变化一次加1
         
     def connect(self, credentials: Dict[str, Any]) -> bool:
         """连接到模拟交易系统"""
@@ -117,9 +254,10 @@ class SimulatedTradingInterface(BaseTradingInterface):
                 margin_used=0.0,
                 margin_available=self.balance
             )
+            self._dirty = True
             return True
         except Exception as e:
-            self.logger.error(f"连接模拟交易系统失败: {e}")
+            self.logger.error("连接模拟交易系统失败: %s", e)
             return False
     
     def disconnect(self) -> bool:
@@ -129,7 +267,7 @@ class SimulatedTradingInterface(BaseTradingInterface):
             self.logger.info("已断开模拟交易系统连接")
             return True
         except Exception as e:
-            self.logger.error(f"断开连接失败: {e}")
+            self.logger.error("断开连接失败: %s", e)
             return False
     
     def get_account_info(self) -> Account:
@@ -137,13 +275,17 @@ class SimulatedTradingInterface(BaseTradingInterface):
         if not self.is_connected:
             raise RuntimeError("未连接到交易系统")
         
+        # 资金和持仓未变化时直接返回缓存的账户信息
+        if not self._dirty:
+            return self.account_info
+        
         # 计算总价值（现金 + 持仓市值）
-        total_position_value = sum(pos.market_value for pos in self.positions.values())
-        total_value = self.balance + total_position_value
+        total_value = self.balance + self._total_position_value
         
         self.account_info.balance = self.balance
         self.account_info.total_value = total_value
         self.account_info.available_cash = self.balance
+        self._dirty = False
         
         return self.account_info
     
@@ -154,17 +296,36 @@ class SimulatedTradingInterface(BaseTradingInterface):
         
         return list(self.positions.values())
     
+    def get_position(self, symbol: str) -> Optional[Position]:
+        """获取指定品种的持仓"""
+        if not self.is_connected:
+            raise RuntimeError("未连接到交易系统")
+        
+        return self.positions.get(symbol)
+    
     def place_order(self, order: Order) -> str:
         """下单"""
         if not self.is_connected:
             raise RuntimeError("未连接到交易系统")
         
+        return self._submit_order(order, datetime.now())
+    
+    def place_orders(self, orders: List[Order]) -> List[str]:
+        """批量下单（只检查一次连接，同一批订单共用同一时间戳）"""
+        if not self.is_connected:
+            raise RuntimeError("未连接到交易系统")
+        
+        now = datetime.now()
+        return [self._submit_order(order, now) for order in orders]
+    
+    def _submit_order(self, order: Order, timestamp: datetime) -> str:
+        """生成订单ID并模拟撮合"""
         try:
             # 生成订单ID
             self.order_counter += 1
             order_id = f"SIM_{self.order_counter:06d}"
             order.order_id = order_id
-            order.timestamp = datetime.now()
+            order.timestamp = timestamp
             
             # 模拟订单执行（这里简化处理，实际应该有更复杂的逻辑）
             if order.order_type == 'MARKET':
@@ -177,11 +338,19 @@ class SimulatedTradingInterface(BaseTradingInterface):
                 self._update_position_and_balance(order)
             
             self.orders[order_id] = order
-            self.logger.info(f"模拟下单成功: {order_id}")
+            self.order_table.append(order)
+            if len(self.orders) > self.max_orders:
+                evicted_id, _ = self.orders.popitem(last=False)
+                self.order_table.remove(evicted_id)
+                self.logger.debug("移除最早的订单记录: %s", evicted_id)
+                if not self._orders_evicted:
+                    self._orders_evicted = True
+                    self.logger.warning("订单记录超过上限 %s，开始移除最早的订单", self.max_orders)
+            self.logger.info("模拟下单成功: %s", order_id)
             return order_id
             
         except Exception as e:
-            self.logger.error(f"模拟下单失败: {e}")
+            self.logger.error("模拟下单失败: %s", e)
             return ""
     
     def cancel_order(self, order_id: str) -> bool:
@@ -194,17 +363,18 @@ class SimulatedTradingInterface(BaseTradingInterface):
                 order = self.orders[order_id]
                 if order.status == 'PENDING':
                     order.status = 'CANCELLED'
-                    self.logger.info(f"模拟撤单成功: {order_id}")
+                    self.order_table.set_status(order_id, order.status)
+                    self.logger.info("模拟撤单成功: %s", order_id)
                     return True
                 else:
-                    self.logger.warning(f"订单状态不允许撤单: {order.status}")
+                    self.logger.warning("订单状态不允许撤单: %s", order.status)
                     return False
             else:
-                self.logger.warning(f"订单不存在: {order_id}")
+                self.logger.warning("订单不存在: %s", order_id)
                 return False
                 
         except Exception as e:
-            self.logger.error(f"模拟撤单失败: {e}")
+            self.logger.error("模拟撤单失败: %s", e)
             return False
     
     def get_order_status(self, order_id: str) -> Order:
@@ -217,6 +387,10 @@ class SimulatedTradingInterface(BaseTradingInterface):
         else:
             raise ValueError(f"订单不存在: {order_id}")
     
+    def get_order_statistics(self) -> Dict[str, Any]:
+        """获取订单汇总统计（成交数、手续费、成交量等）"""
+        return self.order_table.statistics()
+    
     def get_market_data(self, symbol: str) -> Dict[str, Any]:
         """获取市场数据"""
         if not self.is_connected:
@@ -232,27 +406,45 @@ class SimulatedTradingInterface(BaseTradingInterface):
             'timestamp': datetime.now()
         }
     
+    def get_market_data_batch(self, symbols: List[str]) -> Dict[str, Dict[str, Any]]:
+        """批量获取市场数据（只检查一次连接，共用同一时间戳）"""
+        if not self.is_connected:
+            raise RuntimeError("未连接到交易系统")
+        
+        now = datetime.now()
+        return {
+            symbol: {
+                'symbol': symbol,
+                'last_price': 100.0,
+                'bid_price': 99.9,
+                'ask_price': 100.1,
+                'volume': 1000,
+                'timestamp': now
+            }
+            for symbol in symbols
+        }
+    
     def _update_position_and_balance(self, order: Order):
         """更新持仓和资金"""
         try:
             symbol = order.symbol
             quantity = order.filled_quantity
             price = order.avg_fill_price
+            self._dirty = True
+            self.account_version += 1
+            
+            pos = self.positions.get(symbol)
             
             if order.direction == 'BUY':
                 # 买入
-                cost = quantity * price + order.commission
-                self.balance -= cost
-                
-                if symbol in self.positions:
+                if pos is not None:
                     # 加仓
-                    pos = self.positions[symbol]
-                    total_quantity = pos.quantity + quantity
-                    total_cost = pos.quantity * pos.avg_price + quantity * price
-                    pos.avg_price = total_cost / total_quantity
-                    pos.quantity = total_quantity
+                    self.balance, pos.quantity, pos.avg_price = _buy_fill(
+                        self.balance, pos.quantity, pos.avg_price, quantity, price, order.commission
+                    )
                 else:
                     # 新建持仓
+                    self.balance, _, _ = _buy_fill(self.balance, 0.0, price, quantity, price, order.commission)
                     self.positions[symbol] = Position(
                         symbol=symbol,
                         quantity=quantity,
@@ -260,28 +452,32 @@ class SimulatedTradingInterface(BaseTradingInterface):
                         market_value=quantity * price,
                         unrealized_pnl=0.0
                     )
+                    self._total_position_value += quantity * price
             
             elif order.direction == 'SELL':
                 # 卖出
-                revenue = quantity * price - order.commission
-                self.balance += revenue
+                pos_quantity, pos_avg_price = (pos.quantity, pos.avg_price) if pos is not None else (0.0, price)
+                self.balance, remaining, realized_pnl = _sell_fill(
+                    self.balance, pos_quantity, pos_avg_price, quantity, price, order.commission
+                )
                 
-                if symbol in self.positions:
-                    pos = self.positions[symbol]
+                if pos is not None:
                     if pos.quantity >= quantity:
                         # 平仓
-                        realized_pnl = (price - pos.avg_price) * quantity
                         pos.realized_pnl += realized_pnl
-                        pos.quantity -= quantity
+                        pos.quantity = remaining
                         
                         if pos.quantity == 0:
                             # 完全平仓
+                            self._total_position_value -= pos.market_value
                             del self.positions[symbol]
+                            if not self.positions:
+                                self._total_position_value = 0.0  # 清除累计误差
                     else:
-                        self.logger.warning(f"持仓不足，无法卖出 {quantity} 手 {symbol}")
+                        self.logger.warning("持仓不足，无法卖出 %s 手 %s", quantity, symbol)
                 
         except Exception as e:
-            self.logger.error(f"更新持仓和资金失败: {e}")
+            self.logger.error("更新持仓和资金失败: %s", e)
 
 class CTAInterface(BaseTradingInterface):
     """CTA交易接口（期货）"""
@@ -312,6 +508,10 @@ class CTAInterface(BaseTradingInterface):
         """获取CTA持仓信息"""
         raise NotImplementedError("CTA持仓信息获取功能待实现")
     
+    def get_position(self, symbol: str) -> Optional[Position]:
+        """获取CTA指定品种持仓"""
+        raise NotImplementedError("CTA持仓信息获取功能待实现")
+    
     def place_order(self, order: Order) -> str:
         """CTA下单"""
         raise NotImplementedError("CTA下单功能待实现")
@@ -336,11 +536,17 @@ class TradingBot:
         self.logger = logging.getLogger(__name__)
         self.is_running = False
         self.strategies = []
+        self._pending_signals: List[Tuple[str, int, float]] = []  # 待提交的(品种, 信号, 价格)
+        self.signal_batch_size = 20  # 累积到该数量时立即提交
+        self.signal_flush_interval = 1.0  # 首个信号缓存后最多等待的秒数，到时未满一批也提交
+        self._flush_timer = None
+        self._signal_lock = threading.RLock()  # 定时提交在计时器线程中执行
+        self.flush_callbacks: List[Callable] = []  # 每批信号提交后调用
         
     def add_strategy(self, strategy):
         """添加交易策略"""
         self.strategies.append(strategy)
-        self.logger.info(f"添加交易策略: {strategy.__class__.__name__}")
+        self.logger.info("添加交易策略: %s", strategy.__class__.__name__)
     
     def start(self):
         """启动交易机器人"""
@@ -354,81 +560,100 @@ class TradingBot:
     
     def stop(self):
         """停止交易机器人"""
+        self.flush_signals()
         self.is_running = False
         self.logger.info("交易机器人已停止")
     
     def process_signal(self, symbol: str, signal: int, current_price: float):
-        """处理交易信号"""
-        try:
-            if not self.is_running:
-                return
+        """处理交易信号
+        
+        信号先缓存，累积到signal_batch_size条时立即批量下单；未满一批时最迟在
+        signal_flush_interval秒后由计时器提交，也可随时调用flush_signals提交
+        """
+        if not self.is_running or signal == 0:
+            return
+        
+        with self._signal_lock:
+            self._pending_signals.append((symbol, signal, current_price))
+            if len(self._pending_signals) >= self.signal_batch_size:
+                self.flush_signals()
+            elif self._flush_timer is None:
+                self._flush_timer = threading.Timer(self.signal_flush_interval, self.flush_signals)
+                self._flush_timer.daemon = True
+                self._flush_timer.start()
+    
+    def flush_signals(self):
+        """按到达顺序批量处理缓存的交易信号，整批只查询一次账户、只提交一次订单"""
+        with self._signal_lock:
+            if self._flush_timer is not None:
+                self._flush_timer.cancel()
+                self._flush_timer = None
             
-            if signal > 0:
-                # 买入信号
-                self._handle_buy_signal(symbol, signal, current_price)
-            elif signal < 0:
-                # 卖出信号
-                self._handle_sell_signal(symbol, signal, current_price)
-                
-        except Exception as e:
-            self.logger.error(f"处理交易信号失败: {e}")
-    
-    def _handle_buy_signal(self, symbol: str, signal: int, price: float):
-        """处理买入信号"""
-        try:
-            # 计算下单数量（这里简化处理）
-            account = self.trading_interface.get_account_info()
-            max_position_value = account.available_cash * 0.1  # 每次最多用10%资金
-            quantity = int(max_position_value / price)
+            signals, self._pending_signals = self._pending_signals, []
+            if not signals or not self.is_running:
+                return
             
-            if quantity > 0:
-                order = Order(
-                    order_id="",
-                    symbol=symbol,
-                    direction="BUY",
-                    order_type="MARKET",
-                    quantity=quantity,
-                    price=price
-                )
-                
-                order_id = self.trading_interface.place_order(order)
-                if order_id:
-                    self.logger.info(f"买入订单已提交: {symbol}, 数量: {quantity}, 价格: {price}")
+            try:
+                orders = self._orders_for_signals(signals)
+                if orders:
+                    order_ids = self.trading_interface.place_orders(orders)
+                    for order, order_id in zip(orders, order_ids):
+                        if order_id:
+                            self.logger.info("%s订单已提交: %s, 数量: %s, 价格: %s",
+                                             "买入" if order.direction == 'BUY' else "卖出",
+                                             order.symbol, order.quantity, order.price)
                     
-        except Exception as e:
-            self.logger.error(f"处理买入信号失败: {e}")
-    
-    def _handle_sell_signal(self, symbol: str, signal: int, price: float):
-        """处理卖出信号"""
-        try:
-            # 查找该品种的持仓
-            positions = self.trading_interface.get_positions()
-            target_position = None
-            
-            for pos in positions:
-                if pos.symbol == symbol and pos.quantity > 0:
-                    target_position = pos
-                    break
+            except Exception as e:
+                self.logger.error("处理交易信号失败: %s", e)
+        
+        for callback in self.flush_callbacks:
+            try:
+                callback()
+            except Exception as e:
+                self.logger.error("回调函数执行失败: %s", e)
+    
+    def _orders_for_signals(self, signals: List[Tuple[str, int, float]]) -> List[Order]:
+        """按信号顺序生成订单，结果与逐条处理相同
+        
+        账户只查询一次，之后的可用资金和持仓按本批已生成的订单在本地推算：
+        买入使用当前剩余可用资金的10%，卖出平掉当前全部持仓
+        """
+        available_cash = self.trading_interface.get_account_info().available_cash
+        positions = {}  # 品种 -> 本批内推算的持仓数量
+        orders = []
+        
+        for symbol, signal, price in signals:
+            if symbol not in positions:
+                position = self.trading_interface.get_position(symbol)
+                positions[symbol] = position.quantity if position else 0
             
-            if target_position:
-                # 平仓
-                order = Order(
-                    order_id="",
-                    symbol=symbol,
-                    direction="SELL",
-                    order_type="MARKET",
-                    quantity=target_position.quantity,
-                    price=price
-                )
-                
-                order_id = self.trading_interface.place_order(order)
-                if order_id:
-                    self.logger.info(f"卖出订单已提交: {symbol}, 数量: {target_position.quantity}, 价格: {price}")
+            if signal > 0:
+                # 计算下单数量（这里简化处理）
+                quantity = int(available_cash * 0.1 / price)
+                if quantity <= 0:
+                    continue
+                available_cash -= quantity * price
+                positions[symbol] += quantity
+                direction = "BUY"
             else:
-                self.logger.info(f"没有 {symbol} 的持仓，无法卖出")
-                
-        except Exception as e:
-            self.logger.error(f"处理卖出信号失败: {e}")
+                quantity = positions[symbol]
+                if quantity <= 0:
+                    self.logger.info("没有 %s 的持仓，无法卖出", symbol)
+                    continue
+                available_cash += quantity * price
+                positions[symbol] = 0
+                direction = "SELL"
+            
+            orders.append(Order(
+                order_id="",
+                symbol=symbol,
+                direction=direction,
+                order_type="MARKET",
+                quantity=quantity,
+                price=price
+            ))
+        
+        return orders
 
 class LiveTradingManager:
     """实盘交易管理器"""
@@ -437,10 +662,33 @@ class LiveTradingManager:
         self.logger = logging.getLogger(__name__)
         self.trading_interface = None
         self.trading_bot = None
+        self._interfaces = weakref.WeakValueDictionary()  # 接口类型 -> 接口实例（弱引用，仅供查看）
+        self.status_callbacks = []  # 交易状态变化时通知（用于UI更新）
+    
+    def add_status_callback(self, callback: Callable):
+        """添加交易状态变化回调函数"""
+        self.status_callbacks.append(callback)
+    
+    def notify_status_change(self, event: str):
+        """通知所有回调函数交易状态已变化"""
+        for callback in self.status_callbacks:
+            try:
+                callback(event)
+            except Exception as e:
+                self.logger.error("回调函数执行失败: %s", e)
         
     def initialize_interface(self, interface_type: str = "simulated") -> bool:
         """初始化交易接口"""
         try:
+            # 释放旧接口：先停止机器人并断开连接，避免残留引用
+            if self.trading_bot:
+                self.trading_bot.stop()
+                self.trading_bot = None
+            if self.trading_interface:
+                if self.trading_interface.is_connected:
+                    self.trading_interface.disconnect()
+                self.trading_interface = None
+            
             if interface_type == "simulated":
                 self.trading_interface = SimulatedTradingInterface()
             elif interface_type == "cta":
@@ -448,12 +696,14 @@ class LiveTradingManager:
             else:
                 raise ValueError(f"不支持的接口类型: {interface_type}")
             
+            self._interfaces[interface_type] = self.trading_interface
             self.trading_bot = TradingBot(self.trading_interface)
-            self.logger.info(f"交易接口初始化成功: {interface_type}")
+            self.trading_bot.flush_callbacks.append(lambda: self.notify_status_change('orders'))
+            self.logger.info("交易接口初始化成功: %s", interface_type)
             return True
             
         except Exception as e:
-            self.logger.error(f"交易接口初始化失败: {e}")
+            self.logger.error("交易接口初始化失败: %s", e)
             return False
     
     def connect_to_trading_system(self, credentials: Dict[str, Any]) -> bool:
@@ -462,7 +712,20 @@ class LiveTradingManager:
             self.logger.error("交易接口未初始化")
             return False
         
-        return self.trading_interface.connect(credentials)
+        success = self.trading_interface.connect(credentials)
+        self.notify_status_change('connect')
+        return success
+    
+    def disconnect_from_trading_system(self) -> bool:
+        """断开交易系统连接"""
+        if not self.trading_interface:
+            return False
+        
+        if self.trading_bot:
+            self.trading_bot.stop()
+        success = self.trading_interface.disconnect()
+        self.notify_status_change('disconnect')
+        return success
     
     def start_live_trading(self) -> bool:
         """启动实盘交易"""
@@ -470,17 +733,21 @@ class LiveTradingManager:
             self.logger.error("交易机器人未初始化")
             return False
         
-        return self.trading_bot.start()
+        success = self.trading_bot.start()
+        self.notify_status_change('start')
+        return success
     
     def stop_live_trading(self):
         """停止实盘交易"""
         if self.trading_bot:
             self.trading_bot.stop()
+            self.notify_status_change('stop')
     
     def send_trading_signal(self, symbol: str, signal: int, price: float):
         """发送交易信号"""
         if self.trading_bot:
             self.trading_bot.process_signal(symbol, signal, price)
+            self.notify_status_change('signal')
     
     def get_trading_status(self) -> Dict[str, Any]:
         """获取交易状态"""
@@ -504,7 +771,7 @@ class LiveTradingManager:
             }
             
         except Exception as e:
-            self.logger.error(f"获取交易状态失败: {e}")
+            self.logger.error("获取交易状态失败: %s", e)
             return {
                 'connected': False,
                 'bot_running': False,
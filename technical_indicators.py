@@ -5,20 +5,120 @@
 import numpy as np
 import pandas as pd
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from typing import Tuple, Dict, List, Optional
 from datetime import datetime, timedelta
+from numpy.lib.stride_tricks import sliding_window_view
+
+# TA-Lib为可选依赖，安装后SMA/WMA/RSI交由其C实现计算
+try:
+    import talib
+except ImportError:
+    talib = None
+
+def _talib_ready(values: np.ndarray, period: int) -> bool:
+    """是否可以用TA-Lib计算（TA-Lib遇到中间的NaN会一直传播，因此只处理无缺失值的序列）"""
+    return talib is not None and 2 <= period <= len(values) and not np.isnan(values).any()
+
+def _cluster_levels(levels: np.ndarray, tolerance: float) -> List[float]:
+    """将价位排序后按相邻间距分组，间距不超过tolerance的归为一组，每组取最低价位"""
+    if not len(levels):
+        return []
+    sorted_levels = np.sort(levels)
+    group_starts = np.concatenate([[True], np.diff(sorted_levels) > tolerance])
+    return sorted_levels[group_starts].tolist()
+
+def _seeded_ewm(values: np.ndarray, period: int, alpha: float) -> np.ndarray:
+    """以前period个有效值的均值为初值的指数平滑：s = s + alpha * (x - s)，初值之前为NaN"""
+    values = np.asarray(values, dtype=np.float64)
+    result = np.full(len(values), np.nan)
+    valid = np.flatnonzero(~np.isnan(values))
+    if len(valid) < period:
+        return result
+    
+    first = valid[0]
+    start = first + period - 1
+    seeded = values[start:].copy()
+    seeded[0] = np.nanmean(values[first:start + 1])
+    # 递推部分即adjust=False的指数平滑，交给pandas的C实现
+    result[start:] = pd.Series(seeded).ewm(alpha=alpha, adjust=False).mean().to_numpy()
+    return result
+
+def _wilder_rma(values: np.ndarray, period: int) -> np.ndarray:
+    """Wilder平滑（RMA），alpha = 1 / period"""
+    return _seeded_ewm(values, period, 1.0 / period)
+
+def _diff(values: np.ndarray) -> np.ndarray:
+    """一阶差分，首个元素为NaN（等价于Series.diff，但不构造Series）"""
+    return np.diff(values, prepend=np.nan)
+
+def _lag(values: np.ndarray) -> np.ndarray:
+    """前一个值，首个元素为NaN（等价于Series.shift(1)，空数组返回空数组）"""
+    shifted = np.empty_like(values, dtype=np.float64)
+    shifted[:1] = np.nan
+    shifted[1:] = values[:-1]
+    return shifted
+
+def _cumsum_skipna(values: np.ndarray) -> np.ndarray:
+    """累加时跳过NaN，NaN位置的结果仍为NaN（与pandas的cumsum一致）"""
+    result = np.nancumsum(values)
+    result[np.isnan(values)] = np.nan
+    return result
+
+# 以下内部函数直接在ndarray上计算，公开方法只在返回时包装一次Series
+def _sma(values: np.ndarray, period: int) -> np.ndarray:
+    """简单移动平均，前period-1个值为NaN"""
+    if _talib_ready(values, period):
+        return talib.SMA(values, timeperiod=period)
+    result = np.full(len(values), np.nan)
+    if len(values) >= period:
+        result[period - 1:] = sliding_window_view(values, period).mean(axis=1)
+    return result
+
+def _ema(values: np.ndarray, period: int) -> np.ndarray:
+    """指数移动平均，以前period个值的SMA为初值，alpha = 2 / (period + 1)"""
+    return _seeded_ewm(values, period, 2.0 / (period + 1))
+
+def _rolling_std(values: np.ndarray, period: int, mean: Optional[np.ndarray] = None) -> np.ndarray:
+    """滚动总体标准差 sqrt(E[x²] - E[x]²)，mean为已计算好的滚动均值"""
+    if mean is None:
+        mean = _sma(values, period)
+    mean_of_squares = _sma(values * values, period)
+    return np.sqrt(np.maximum(mean_of_squares - mean * mean, 0.0))
 
 class TechnicalIndicators:
     """技术指标计算类"""
     
+    ANALYSIS_WORKERS = 4  # 综合分析时并行计算各指标的线程数
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
+        self._executor = None  # 首次综合分析时再创建线程池
+        self._wma_kernels = {}  # 周期 -> 归一化并反转后的WMA卷积核
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取综合分析用的线程池"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.ANALYSIS_WORKERS, thread_name_prefix="indicator"
+            )
+        return self._executor
+    
+    def warm_up(self, bars: int = 80):
+        """用一小段合成行情跑一遍综合分析，提前完成各计算路径的首次初始化（导入、线程池创建等）"""
+        prices = 100.0 + np.sin(np.arange(bars, dtype=np.float64) / 5.0)
+        self.comprehensive_analysis(pd.DataFrame({
+            'high': prices + 1.0,
+            'low': prices - 1.0,
+            'close': prices,
+            'volume': np.full(bars, 1000.0)
+        }))
     
     # 基础移动平均线
     def sma(self, data: pd.Series, period: int) -> pd.Series:
         """简单移动平均线 (Simple Moving Average)"""
         try:
-            return data.rolling(window=period).mean()
+            return pd.Series(_sma(data.to_numpy(dtype=np.float64), period), index=data.index)
         except Exception as e:
             self.logger.error(f"SMA计算失败: {e}")
             return pd.Series(index=data.index, dtype=float)
@@ -26,7 +126,7 @@ class TechnicalIndicators:
     def ema(self, data: pd.Series, period: int) -> pd.Series:
         """指数移动平均线 (Exponential Moving Average)"""
         try:
-            return data.ewm(span=period).mean()
+            return pd.Series(_ema(data.to_numpy(dtype=np.float64), period), index=data.index)
         except Exception as e:
             self.logger.error(f"EMA计算失败: {e}")
             return pd.Series(index=data.index, dtype=float)
@@ -34,13 +134,21 @@ class TechnicalIndicators:
     def wma(self, data: pd.Series, period: int) -> pd.Series:
         """加权移动平均线 (Weighted Moving Average)"""
         try:
-            weights = np.arange(1, period + 1)
-            def weighted_mean(x):
-                if len(x) == period:
-                    return np.sum(weights * x) / np.sum(weights)
-                return np.nan
+            values = data.to_numpy(dtype=np.float64)
+            if _talib_ready(values, period):
+                return pd.Series(talib.WMA(values, timeperiod=period), index=data.index)
+            
+            kernel = self._wma_kernels.get(period)
+            if kernel is None:
+                weights = np.arange(period, 0, -1, dtype=np.float64)
+                kernel = self._wma_kernels[period] = weights / (period * (period + 1) / 2)
             
-            return data.rolling(window=period).apply(weighted_mean, raw=True)
+            # 一次卷积完成所有窗口的加权求和，前period-1个值保持NaN
+            result = np.full(len(values), np.nan)
+            if len(values) >= period:
+                result[period - 1:] = np.convolve(values, kernel, mode='valid')
+            
+            return pd.Series(result, index=data.index)
         except Exception as e:
             self.logger.error(f"WMA计算失败: {e}")
             return pd.Series(index=data.index, dtype=float)
@@ -52,48 +160,73 @@ class TechnicalIndicators:
             ema_fast = self.ema(price, fast)
             ema_slow = self.ema(price, slow)
             
-            macd_line = ema_fast - ema_slow
-            signal_line = self.ema(macd_line, signal)
-            histogram = macd_line - signal_line
-            
-            return {
-                'macd': macd_line,
-                'signal': signal_line,
-                'histogram': histogram
-            }
+            return self._macd_from_emas(ema_fast, ema_slow, signal)
         except Exception as e:
             self.logger.error(f"MACD计算失败: {e}")
             return {'macd': pd.Series(), 'signal': pd.Series(), 'histogram': pd.Series()}
     
+    def _macd_from_emas(self, ema_fast: pd.Series, ema_slow: pd.Series, signal: int = 9) -> Dict[str, pd.Series]:
+        """由已计算好的快慢EMA得到MACD（避免重复计算EMA）"""
+        macd_line = ema_fast - ema_slow
+        signal_line = self.ema(macd_line, signal)
+        histogram = macd_line - signal_line
+        
+        return {
+            'macd': macd_line,
+            'signal': signal_line,
+            'histogram': histogram
+        }
+    
     def rsi(self, price: pd.Series, period: int = 14) -> pd.Series:
         """相对强弱指标 (RSI)"""
         try:
-            delta = price.diff()
-            gain = (delta.where(delta > 0, 0)).rolling(window=period).mean()
-            loss = (-delta.where(delta < 0, 0)).rolling(window=period).mean()
-            
-            rs = gain / loss
+            values = price.to_numpy(dtype=np.float64)
+            delta = _diff(values)
+            if _talib_ready(values, period):
+                rsi = talib.RSI(values, timeperiod=period)
+                # 价格自起点一直不变时平均涨跌幅均为0，TA-Lib给出0，统一为中性值50
+                unchanged = np.concatenate(([False], np.cumsum(np.abs(delta[1:])) == 0))
+                rsi[unchanged & ~np.isnan(rsi)] = 50.0
+                return pd.Series(rsi, index=price.index)
+            
+            missing = np.isnan(delta)
+            gain = np.where(delta > 0, delta, 0.0)
+            loss = np.where(delta < 0, -delta, 0.0)
+            gain[missing] = np.nan
+            loss[missing] = np.nan
+            
+            # Wilder平滑；平均跌幅为0时RS视为无穷大（RSI=100），平均涨跌幅均为0时取中性值50
+            avg_gain = _wilder_rma(gain, period)
+            avg_loss = _wilder_rma(loss, period)
+            rs = np.divide(avg_gain, avg_loss, out=np.full_like(avg_gain, np.inf), where=avg_loss > 0)
             rsi = 100 - (100 / (1 + rs))
+            rsi[(avg_gain == 0) & (avg_loss == 0)] = 50.0
+            rsi[np.isnan(avg_loss)] = np.nan
             
-            return rsi
+            return pd.Series(rsi, index=price.index)
         except Exception as e:
             self.logger.error(f"RSI计算失败: {e}")
             return pd.Series(index=price.index, dtype=float)
     
-    def bollinger_bands(self, price: pd.Series, period: int = 20, std_dev: float = 2) -> Dict[str, pd.Series]:
-        """布林带"""
+    def bollinger_bands(self, price: pd.Series, period: int = 20, std_dev: float = 2,
+                        middle: Optional[pd.Series] = None) -> Dict[str, pd.Series]:
+        """布林带
+        
+        middle: 已计算好的period周期SMA，传入时不再重复计算
+        """
         try:
-            middle = self.sma(price, period)
-            std = price.rolling(window=period).std()
+            values = price.to_numpy(dtype=np.float64)
+            middle_values = _sma(values, period) if middle is None else middle.to_numpy(dtype=np.float64)
+            std = _rolling_std(values, period, middle_values)
             
-            upper = middle + (std_dev * std)
-            lower = middle - (std_dev * std)
+            upper = middle_values + (std_dev * std)
+            lower = middle_values - (std_dev * std)
             
             return {
-                'upper': upper,
-                'middle': middle,
-                'lower': lower,
-                'bandwidth': (upper - lower) / middle * 100
+                'upper': pd.Series(upper, index=price.index),
+                'middle': pd.Series(middle_values, index=price.index),
+                'lower': pd.Series(lower, index=price.index),
+                'bandwidth': pd.Series((upper - lower) / middle_values * 100, index=price.index)
             }
         except Exception as e:
             self.logger.error(f"布林带计算失败: {e}")
@@ -104,17 +237,19 @@ class TechnicalIndicators:
                                         close: pd.Series, volume: pd.Series) -> pd.Series:
         """维科夫累积/分布指标"""
         try:
-            # 计算价格区间的中点
-            money_flow_multiplier = ((close - low) - (high - close)) / (high - low)
-            money_flow_multiplier = money_flow_multiplier.fillna(0)
+            h, l, c = (s.to_numpy(dtype=np.float64) for s in (high, low, close))
             
-            # 计算资金流量
-            money_flow_volume = money_flow_multiplier * volume
+            # 资金流量乘数，价格区间为0或数据缺失时记为0
+            price_range = h - l
+            money_flow_multiplier = np.divide(
+                (c - l) - (h - c), price_range,
+                out=np.zeros_like(price_range), where=price_range > 0
+            )
+            money_flow_multiplier[np.isnan(money_flow_multiplier)] = 0.0
             
             # 累积资金流量
-            ad_line = money_flow_volume.cumsum()
-            
-            return ad_line
+            money_flow_volume = money_flow_multiplier * volume.to_numpy(dtype=np.float64)
+            return pd.Series(_cumsum_skipna(money_flow_volume), index=close.index)
         except Exception as e:
             self.logger.error(f"维科夫累积/分布计算失败: {e}")
             return pd.Series(index=close.index, dtype=float)
@@ -122,10 +257,12 @@ class TechnicalIndicators:
     def wyckoff_price_volume_trend(self, close: pd.Series, volume: pd.Series) -> pd.Series:
         """维科夫价量趋势指标"""
         try:
-            price_change = close.pct_change()
-            pvt = (price_change * volume).cumsum()
+            c = close.to_numpy(dtype=np.float64)
+            prev_close = np.concatenate(([np.nan], c[:-1]))
+            with np.errstate(divide='ignore', invalid='ignore'):
+                price_change = c / prev_close - 1
             
-            return pvt
+            return pd.Series(_cumsum_skipna(price_change * volume.to_numpy(dtype=np.float64)), index=close.index)
         except Exception as e:
             self.logger.error(f"维科夫价量趋势计算失败: {e}")
             return pd.Series(index=close.index, dtype=float)
@@ -135,13 +272,16 @@ class TechnicalIndicators:
         """成交量分布"""
         try:
             price_range = np.linspace(low.min(), high.max(), bins + 1)
-            volume_at_price = np.zeros(bins)
             
-            for i in range(len(close)):
-                if pd.notna(close.iloc[i]) and pd.notna(volume.iloc[i]):
-                    price_bin = np.digitize(close.iloc[i], price_range) - 1
-                    if 0 <= price_bin < bins:
-                        volume_at_price[price_bin] += volume.iloc[i]
+            # 一次性为所有有效K线分箱，再按成交量加权计数
+            close_values = close.to_numpy(dtype=np.float64)
+            volume_values = volume.to_numpy(dtype=np.float64)
+            valid = ~(np.isnan(close_values) | np.isnan(volume_values))
+            price_bins = np.digitize(close_values[valid], price_range) - 1
+            in_range = (price_bins >= 0) & (price_bins < bins)
+            volume_at_price = np.bincount(
+                price_bins[in_range], weights=volume_values[valid][in_range], minlength=bins
+            )
             
             price_levels = (price_range[:-1] + price_range[1:]) / 2
             
@@ -163,55 +303,33 @@ class TechnicalIndicators:
                                  close: pd.Series, lookback: int = 20) -> Dict:
         """支撑阻力位识别"""
         try:
-            # 寻找局部高点和低点
-            highs = []
-            lows = []
-            
-            for i in range(lookback, len(close) - lookback):
-                # 检查是否为局部高点
-                if high.iloc[i] == high.iloc[i-lookback:i+lookback+1].max():
-                    highs.append((close.index[i], high.iloc[i]))
-                
-                # 检查是否为局部低点
-                if low.iloc[i] == low.iloc[i-lookback:i+lookback+1].min():
-                    lows.append((close.index[i], low.iloc[i]))
-            
-            # 统计价格出现频率
-            all_levels = [level for _, level in highs + lows]
+            window = 2 * lookback + 1
+            if len(close) < window:
+                return {'resistance_levels': [], 'support_levels': []}
             
-            if not all_levels:
+            # 寻找局部高点和低点：中心值等于其前后lookback根K线窗口内的极值
+            high_values = high.to_numpy(dtype=np.float64)
+            low_values = low.to_numpy(dtype=np.float64)
+            center = slice(lookback, len(close) - lookback)
+            highs = high_values[center][
+                high_values[center] == sliding_window_view(high_values, window).max(axis=1)
+            ]
+            lows = low_values[center][
+                low_values[center] == sliding_window_view(low_values, window).min(axis=1)
+            ]
+            
+            if not len(highs) and not len(lows):
                 return {'resistance_levels': [], 'support_levels': []}
             
             # 使用聚类找到主要支撑阻力位
-            price_range = max(all_levels) - min(all_levels)
+            all_levels = np.concatenate([highs, lows])
+            price_range = all_levels.max() - all_levels.min()
             tolerance = price_range * 0.02  # 2%的容忍度
             
-            resistance_levels = []
-            support_levels = []
-            
-            for _, level in highs:
-                # 检查是否与现有阻力位接近
-                is_new = True
-                for existing in resistance_levels:
-                    if abs(level - existing) <= tolerance:
-                        is_new = False
-                        break
-                if is_new:
-                    resistance_levels.append(level)
-            
-            for _, level in lows:
-                # 检查是否与现有支撑位接近
-                is_new = True
-                for existing in support_levels:
-                    if abs(level - existing) <= tolerance:
-                        is_new = False
-                        break
-                if is_new:
-                    support_levels.append(level)
-            
+            # _cluster_levels已按价位升序返回且每组只保留一个价位，无需再排序去重
             return {
-                'resistance_levels': sorted(resistance_levels, reverse=True),
-                'support_levels': sorted(support_levels)
+                'resistance_levels': _cluster_levels(highs, tolerance)[::-1],
+                'support_levels': _cluster_levels(lows, tolerance)
             }
         except Exception as e:
             self.logger.error(f"支撑阻力位计算失败: {e}")
@@ -221,14 +339,18 @@ class TechnicalIndicators:
     def atr(self, high: pd.Series, low: pd.Series, close: pd.Series, period: int = 14) -> pd.Series:
         """平均真实范围 (Average True Range)"""
         try:
-            tr1 = high - low
-            tr2 = abs(high - close.shift(1))
-            tr3 = abs(low - close.shift(1))
-            
-            true_range = pd.concat([tr1, tr2, tr3], axis=1).max(axis=1)
-            atr = true_range.rolling(window=period).mean()
-            
-            return atr
+            high_values = high.to_numpy(dtype=np.float64)
+            low_values = low.to_numpy(dtype=np.float64)
+            prev_close = _lag(close.to_numpy(dtype=np.float64))
+            
+            # 逐元素取三者最大值（fmax忽略NaN，首根K线退化为最高价-最低价）
+            true_range = np.fmax.reduce([
+                high_values - low_values,
+                np.abs(high_values - prev_close),
+                np.abs(low_values - prev_close)
+            ])
+            
+            return pd.Series(_wilder_rma(true_range, period), index=close.index)
         except Exception as e:
             self.logger.error(f"ATR计算失败: {e}")
             return pd.Series(index=close.index, dtype=float)
@@ -237,30 +359,28 @@ class TechnicalIndicators:
         """平均方向指数 (ADX)"""
         try:
             # 计算方向移动
-            up_move = high - high.shift(1)
-            down_move = low.shift(1) - low
+            up_move = _diff(high.to_numpy(dtype=np.float64))
+            down_move = -_diff(low.to_numpy(dtype=np.float64))
             
-            plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0)
-            minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0)
-            
-            plus_dm = pd.Series(plus_dm, index=close.index)
-            minus_dm = pd.Series(minus_dm, index=close.index)
+            plus_dm = np.where((up_move > down_move) & (up_move > 0), up_move, 0.0)
+            minus_dm = np.where((down_move > up_move) & (down_move > 0), down_move, 0.0)
             
             # 计算真实范围
-            atr_values = self.atr(high, low, close, period)
-            
-            # 计算方向指标
-            plus_di = 100 * (plus_dm.rolling(window=period).mean() / atr_values)
-            minus_di = 100 * (minus_dm.rolling(window=period).mean() / atr_values)
+            atr_values = self.atr(high, low, close, period).to_numpy()
             
-            # 计算ADX
-            dx = 100 * abs(plus_di - minus_di) / (plus_di + minus_di)
-            adx = dx.rolling(window=period).mean()
+            with np.errstate(divide='ignore', invalid='ignore'):
+                # 计算方向指标（Wilder平滑）
+                plus_di = 100 * (_wilder_rma(plus_dm, period) / atr_values)
+                minus_di = 100 * (_wilder_rma(minus_dm, period) / atr_values)
+                
+                # 计算ADX
+                dx = 100 * np.abs(plus_di - minus_di) / (plus_di + minus_di)
+            adx = _wilder_rma(dx, period)
             
             return {
-                'adx': adx,
-                'plus_di': plus_di,
-                'minus_di': minus_di
+                'adx': pd.Series(adx, index=close.index),
+                'plus_di': pd.Series(plus_di, index=close.index),
+                'minus_di': pd.Series(minus_di, index=close.index)
             }
         except Exception as e:
             self.logger.error(f"ADX计算失败: {e}")
@@ -288,39 +408,51 @@ class TechnicalIndicators:
     def trend_strength(self, close: pd.Series, period: int = 20) -> pd.Series:
         """趋势强度指标"""
         try:
-            # 使用线性回归计算趋势强度
-            def calculate_r_squared(y):
-                if len(y) < period:
-                    return np.nan
-                
-                x = np.arange(len(y))
-                if np.std(y) == 0:
-                    return 0
+            # 使用线性回归计算趋势强度：x固定为0..period-1，按窗口向量化计算相关系数的平方
+            y = close.to_numpy(dtype=np.float64)
+            r_squared = np.full(len(y), np.nan)
+            if len(y) >= period:
+                windows = sliding_window_view(y, period)
+                x_centered = np.arange(period) - (period - 1) / 2
+                y_centered = windows - windows.mean(axis=1, keepdims=True)
                 
-                correlation = np.corrcoef(x, y)[0, 1]
-                return correlation ** 2 if not np.isnan(correlation) else 0
-            
-            r_squared = close.rolling(window=period).apply(calculate_r_squared, raw=True)
-            
-            return r_squared
+                numerator = y_centered @ x_centered
+                denominator = np.sqrt((x_centered @ x_centered) * np.einsum('ij,ij->i', y_centered, y_centered))
+                flat = windows.max(axis=1) == windows.min(axis=1)
+                with np.errstate(invalid='ignore', divide='ignore'):
+                    correlation = numerator / denominator
+                r_squared[period - 1:] = np.where(flat, 0.0, correlation ** 2)
+            
+            return pd.Series(r_squared, index=close.index)
         except Exception as e:
             self.logger.error(f"趋势强度计算失败: {e}")
             return pd.Series(index=close.index, dtype=float)
     
     def sideways_market_detection(self, high: pd.Series, low: pd.Series, 
                                  close: pd.Series, period: int = 20, 
-                                 threshold: float = 0.02) -> pd.Series:
-        """横盘震荡识别"""
+                                 threshold: float = 0.02,
+                                 rolling_high_max: Optional[pd.Series] = None,
+                                 rolling_low_min: Optional[pd.Series] = None,
+                                 trend_strength_values: Optional[pd.Series] = None) -> pd.Series:
+        """横盘震荡识别
+        
+        rolling_high_max/rolling_low_min/trend_strength_values: 已按period计算好的指标，传入时直接复用
+        """
         try:
+            if rolling_high_max is None:
+                rolling_high_max = high.rolling(window=period).max()
+            if rolling_low_min is None:
+                rolling_low_min = low.rolling(window=period).min()
+            
             # 计算价格波动范围
-            price_range = (high.rolling(window=period).max() - 
-                          low.rolling(window=period).min()) / close
+            price_range = (rolling_high_max - rolling_low_min) / close
             
             # 计算趋势强度
-            trend_strength = self.trend_strength(close, period)
+            if trend_strength_values is None:
+                trend_strength_values = self.trend_strength(close, period)
             
             # 震荡市场：价格波动小且趋势强度弱
-            is_sideways = (price_range < threshold) & (trend_strength < 0.3)
+            is_sideways = (price_range < threshold) & (trend_strength_values < 0.3)
             
             return is_sideways.astype(int)
         except Exception as e:
@@ -329,30 +461,46 @@ class TechnicalIndicators:
     
     def breakout_potential(self, high: pd.Series, low: pd.Series, 
                           close: pd.Series, volume: pd.Series, 
-                          period: int = 20) -> Dict[str, pd.Series]:
-        """突破潜力分析"""
+                          period: int = 20,
+                          rolling_high_max: Optional[pd.Series] = None,
+                          rolling_low_min: Optional[pd.Series] = None,
+                          rolling_vol_mean: Optional[pd.Series] = None,
+                          bb: Optional[Dict[str, pd.Series]] = None) -> Dict[str, pd.Series]:
+        """突破潜力分析
+        
+        rolling_high_max/rolling_low_min/rolling_vol_mean/bb: 已按period计算好的指标，传入时直接复用
+        """
         try:
-            # 计算布林带收缩
-            bb = self.bollinger_bands(close, period)
-            bb_squeeze = bb['bandwidth'] < bb['bandwidth'].rolling(window=period).mean() * 0.8
-            
-            # 计算成交量异常
-            avg_volume = volume.rolling(window=period).mean()
-            volume_spike = volume > avg_volume * 1.5
-            
-            # 计算价格接近边界
-            near_resistance = close > high.rolling(window=period).max() * 0.98
-            near_support = close < low.rolling(window=period).min() * 1.02
+            if bb is None:
+                bb = self.bollinger_bands(close, period)
+            if rolling_vol_mean is None:
+                rolling_vol_mean = volume.rolling(window=period).mean()
+            if rolling_high_max is None:
+                rolling_high_max = high.rolling(window=period).max()
+            if rolling_low_min is None:
+                rolling_low_min = low.rolling(window=period).min()
+            
+            # 以下全部在ndarray上逐元素比较，最后统一包装为Series
+            c = close.to_numpy(dtype=np.float64)
+            v = volume.to_numpy(dtype=np.float64)
+            bandwidth = bb['bandwidth'].to_numpy(dtype=np.float64)
+            
+            # 布林带收缩、成交量异常、价格接近边界
+            bb_squeeze = bandwidth < _sma(bandwidth, period) * 0.8
+            volume_spike = v > rolling_vol_mean.to_numpy(dtype=np.float64) * 1.5
+            squeeze_with_volume = bb_squeeze & volume_spike
+            near_resistance = c > rolling_high_max.to_numpy(dtype=np.float64) * 0.98
+            near_support = c < rolling_low_min.to_numpy(dtype=np.float64) * 1.02
             
             # 综合突破信号
-            breakout_up_potential = bb_squeeze & volume_spike & near_resistance
-            breakout_down_potential = bb_squeeze & volume_spike & near_support
-            
             return {
-                'breakout_up': breakout_up_potential.astype(int),
-                'breakout_down': breakout_down_potential.astype(int),
-                'bb_squeeze': bb_squeeze.astype(int),
-                'volume_spike': volume_spike.astype(int)
+                name: pd.Series(flags.astype(int), index=close.index)
+                for name, flags in (
+                    ('breakout_up', squeeze_with_volume & near_resistance),
+                    ('breakout_down', squeeze_with_volume & near_support),
+                    ('bb_squeeze', bb_squeeze),
+                    ('volume_spike', volume_spike)
+                )
             }
         except Exception as e:
             self.logger.error(f"突破潜力分析失败: {e}")
@@ -371,58 +519,97 @@ class TechnicalIndicators:
             if not all(col in data.columns for col in required_columns):
                 raise ValueError(f"数据必须包含列: {required_columns}")
             
-            result = {}
-            
-            # 基础移动平均线
-            result['sma_5'] = self.sma(data['close'], 5)
-            result['sma_20'] = self.sma(data['close'], 20)
-            result['sma_60'] = self.sma(data['close'], 60)
-            result['ema_12'] = self.ema(data['close'], 12)
-            result['ema_26'] = self.ema(data['close'], 26)
-            
-            # 趋势指标
-            macd_data = self.macd(data['close'])
-            result.update(macd_data)
-            
-            result['rsi'] = self.rsi(data['close'])
+            high, low, close, volume = (data[col] for col in required_columns)
             
-            bb_data = self.bollinger_bands(data['close'])
-            result.update(bb_data)
-            
-            # 维科夫分析
-            result['wyckoff_ad'] = self.wyckoff_accumulation_distribution(
-                data['high'], data['low'], data['close'], data['volume']
-            )
-            result['wyckoff_pvt'] = self.wyckoff_price_volume_trend(data['close'], data['volume'])
-            
-            # 震荡和趋势分析
-            result['atr'] = self.atr(data['high'], data['low'], data['close'])
+            # 基础移动平均线：收盘价只转换一次，均线在ndarray上计算后统一包装
+            close_values = close.to_numpy(dtype=np.float64)
+            averages = {
+                name: pd.Series(func(close_values, period), index=data.index)
+                for name, func, period in (('sma_5', _sma, 5), ('sma_20', _sma, 20), ('sma_60', _sma, 60),
+                                           ('ema_12', _ema, 12), ('ema_26', _ema, 26))
+            }
             
-            adx_data = self.adx(data['high'], data['low'], data['close'])
-            result.update(adx_data)
+            # 第一阶段：互不依赖的指标并行计算
+            executor = self._get_executor()
+            futures = {
+                'macd': executor.submit(self._macd_from_emas, averages['ema_12'], averages['ema_26']),
+                'rsi': executor.submit(self.rsi, close),
+                'bb': executor.submit(self.bollinger_bands, close, middle=averages['sma_20']),
+                'wyckoff_ad': executor.submit(self.wyckoff_accumulation_distribution, high, low, close, volume),
+                'wyckoff_pvt': executor.submit(self.wyckoff_price_volume_trend, close, volume),
+                'atr': executor.submit(self.atr, high, low, close),
+                'adx': executor.submit(self.adx, high, low, close),
+                'trend_strength': executor.submit(self.trend_strength, close),
+                'support_resistance': executor.submit(self.support_resistance_levels, high, low, close)
+            }
             
-            result['trend_strength'] = self.trend_strength(data['close'])
-            result['sideways_market'] = self.sideways_market_detection(
-                data['high'], data['low'], data['close']
+            # 震荡识别和突破分析共用的20周期滚动指标只计算一次
+            rolling_high_max = high.rolling(window=20).max()
+            rolling_low_min = low.rolling(window=20).min()
+            rolling_vol_mean = volume.rolling(window=20).mean()
+            
+            # 第二阶段：依赖趋势强度、布林带的指标
+            trend_strength = futures['trend_strength'].result()
+            bb_data = futures['bb'].result()
+            sideways_future = executor.submit(
+                self.sideways_market_detection, high, low, close,
+                rolling_high_max=rolling_high_max,
+                rolling_low_min=rolling_low_min,
+                trend_strength_values=trend_strength
             )
-            
-            # 突破分析
             breakout_data = self.breakout_potential(
-                data['high'], data['low'], data['close'], data['volume']
+                high, low, close, volume,
+                rolling_high_max=rolling_high_max,
+                rolling_low_min=rolling_low_min,
+                rolling_vol_mean=rolling_vol_mean,
+                bb=bb_data
             )
-            result.update(breakout_data)
             
-            # 支撑阻力位
-            sr_levels = self.support_resistance_levels(
-                data['high'], data['low'], data['close']
-            )
-            result['support_resistance'] = sr_levels
+            # 按原有顺序汇总结果
+            result = dict(averages)
+            result.update(futures['macd'].result())
+            result['rsi'] = futures['rsi'].result()
+            result.update(bb_data)
+            result['wyckoff_ad'] = futures['wyckoff_ad'].result()
+            result['wyckoff_pvt'] = futures['wyckoff_pvt'].result()
+            result['atr'] = futures['atr'].result()
+            result.update(futures['adx'].result())
+            result['trend_strength'] = trend_strength
+            result['sideways_market'] = sideways_future.result()
+            result.update(breakout_data)
+            result['support_resistance'] = futures['support_resistance'].result()
             
             return result
             
         except Exception as e:
             self.logger.error(f"综合分析失败: {e}")
             return {}
+    
+    def comprehensive_analysis_multi(self, data: pd.DataFrame, symbol_col: str = 'symbol') -> pd.DataFrame:
+        """多品种批量综合技术分析
+        
+        data为按symbol_col区分品种的长表，返回与data行一一对应的指标列（不含支撑阻力位）
+        """
+        try:
+            if symbol_col not in data.columns:
+                raise ValueError(f"数据必须包含列: {symbol_col}")
+            
+            columns = {}
+            # indices给出每个品种的行位置，按位置切片和回填，不依赖索引是否唯一
+            for symbol, positions in data.groupby(symbol_col, sort=False).indices.items():
+                result = self.comprehensive_analysis(data.iloc[positions])
+                for name, values in result.items():
+                    if not isinstance(values, pd.Series):
+                        continue
+                    if name not in columns:
+                        columns[name] = np.full(len(data), np.nan)
+                    columns[name][positions] = values.to_numpy(dtype=np.float64)
+            
+            return pd.DataFrame(columns, index=data.index)
+            
+        except Exception as e:
+            self.logger.error(f"多品种综合分析失败: {e}")
+            return pd.DataFrame()
 
 # 全局技术指标实例
 tech_indicators = TechnicalIndicators()
\ No newline at end of file
@@ -0,0 +1,82 @@
+"""TradingBot信号批量提交测试（使用模拟交易接口）"""
+import time
+
+import pytest
+
+from live_trading_interface import Order, SimulatedTradingInterface, TradingBot
+
+
+@pytest.fixture
+def bot():
+    interface = SimulatedTradingInterface(initial_balance=100000)
+    interface.connect({})
+    trading_bot = TradingBot(interface)
+    trading_bot.signal_batch_size = 100
+    trading_bot.signal_flush_interval = 60.0
+    trading_bot.start()
+    yield trading_bot
+    trading_bot.stop()
+
+
+def submitted(bot):
+    return [(o.direction, o.symbol, o.quantity, o.price) for o in bot.trading_interface.orders.values()]
+
+
+def test_mixed_batch_keeps_arrival_order(bot):
+    interface = bot.trading_interface
+    interface.place_order(Order(order_id="", symbol="A", direction="BUY",
+                                order_type="MARKET", quantity=100, price=100.0))
+    
+    bot.process_signal("B", 1, 50.0)
+    bot.process_signal("A", -1, 110.0)
+    bot.process_signal("C", 2, 200.0)
+    bot.process_signal("A", -1, 111.0)  # 已在上一条信号平仓，不再下单
+    bot.process_signal("D", -1, 10.0)   # 无持仓，不下单
+    bot.process_signal("E", 0, 10.0)    # 无信号，忽略
+    assert len(submitted(bot)) == 1  # 未满一批且未到时间，尚未下单
+    
+    bot.flush_signals()
+    
+    # 初始资金 100000 - 10000 = 90000
+    # B: int(90000 * 0.1 / 50) = 180，剩余 90000 - 9000 = 81000
+    # A: 平仓 100 手 @110，资金 81000 + 11000 = 92000
+    # C: int(92000 * 0.1 / 200) = 46
+    assert submitted(bot)[1:] == [
+        ("BUY", "B", 180, 50.0),
+        ("SELL", "A", 100, 110.0),
+        ("BUY", "C", 46, 200.0),
+    ]
+    assert interface.get_position("A") is None
+    assert interface.get_account_info().available_cash == pytest.approx(92000 - 46 * 200.0)
+
+
+def test_buy_then_sell_same_symbol_ends_flat(bot):
+    bot.process_signal("X", 1, 100.0)
+    bot.process_signal("X", -1, 100.0)
+    bot.flush_signals()
+    
+    assert submitted(bot) == [("BUY", "X", 100, 100.0), ("SELL", "X", 100, 100.0)]
+    assert bot.trading_interface.get_position("X") is None
+    assert bot.trading_interface.get_account_info().available_cash == pytest.approx(100000)
+
+
+def test_full_batch_is_submitted_immediately(bot):
+    bot.signal_batch_size = 2
+    bot.process_signal("A", 1, 100.0)
+    assert submitted(bot) == []
+    bot.process_signal("B", 1, 100.0)
+    assert [symbol for _, symbol, _, _ in submitted(bot)] == ["A", "B"]
+
+
+def test_partial_batch_is_submitted_by_timer(bot):
+    bot.signal_flush_interval = 0.05
+    flushed = []
+    bot.flush_callbacks.append(lambda: flushed.append(True))
+    bot.process_signal("A", 1, 100.0)
+    
+    deadline = time.monotonic() + 2.0
+    while not flushed and time.monotonic() < deadline:
+        time.sleep(0.01)
+    
+    assert flushed
+    assert [symbol for _, symbol, _, _ in submitted(bot)] == ["A"]
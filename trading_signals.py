@@ -4,315 +4,541 @@
 """
 import pandas as pd
 import numpy as np
+import hashlib
 import logging
+import threading
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime
+from numpy.lib.stride_tricks import sliding_window_view
 from technical_indicators import tech_indicators
 
+# bottleneck为可选依赖，安装后滚动均值/极值交由其C实现计算
+try:
+    import bottleneck as bn
+except ImportError:
+    bn = None
+
+# polars为可选依赖，仅comprehensive_signal_pl需要
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+# 参与信号计算的行情列，缓存键由这些列（含索引）的内容哈希得到
+SIGNAL_INPUT_COLUMNS = ('open', 'high', 'low', 'close', 'volume')
+
+# 市场状态编码（market_regime_detection返回int8编码，需要文字时查REGIME_NAMES）
+REGIME_CODES = {'unknown': 0, 'sideways': 1, 'trending': 2, 'weak_trend': 3}
+REGIME_NAMES = {code: name for name, code in REGIME_CODES.items()}
+
+def _data_fingerprint(data: pd.DataFrame) -> bytes:
+    """行情数据的内容指纹（逐行哈希后再整体摘要）"""
+    columns = [col for col in SIGNAL_INPUT_COLUMNS if col in data.columns]
+    row_hashes = pd.util.hash_pandas_object(data[columns], index=True).to_numpy()
+    return hashlib.blake2b(row_hashes.tobytes(), digest_size=16).digest()
+
+def _cached_signal(func):
+    """按(方法, 行情内容, 参数)缓存子信号结果，同一份数据重复计算时直接返回"""
+    @wraps(func)
+    def wrapper(self, data: pd.DataFrame, *args, **kwargs):
+        ctx = kwargs.pop('ctx', None)  # 共享指标由同一份数据算出，不参与缓存键
+        key = (func.__name__, _data_fingerprint(data), args, tuple(sorted(kwargs.items())))
+        with self._signal_cache_lock:
+            cached = self._signal_cache.get(key)
+            if cached is not None:
+                self._signal_cache.move_to_end(key)
+                return cached.copy()
+        
+        result = func(self, data, *args, ctx=ctx, **kwargs)
+        with self._signal_cache_lock:
+            self._signal_cache[key] = result
+            if len(self._signal_cache) > self.SIGNAL_CACHE_SIZE:
+                self._signal_cache.popitem(last=False)
+        return result.copy()
+    return wrapper
+
+def _shift(values: np.ndarray, periods: int = 1) -> np.ndarray:
+    """向后平移periods个位置，开头补NaN（等价于Series.shift，但只分配一次数组）"""
+    shifted = np.empty_like(values, dtype=np.float64)
+    shifted[:periods] = np.nan
+    shifted[periods:] = values[:len(values) - periods]
+    return shifted
+
+def _crossings(diff: np.ndarray) -> Tuple[np.ndarray, np.ndarray]:
+    """由差值序列d = a - b判断交叉：上穿为d > 0且前值 <= 0，下穿为d < 0且前值 >= 0"""
+    diff_prev = _shift(diff)
+    return (diff > 0) & (diff_prev <= 0), (diff < 0) & (diff_prev >= 0)
+
+def _rolling_mean(values: np.ndarray, window: int) -> np.ndarray:
+    """滚动均值：前缀和相减（s += a[i] - a[i-w]）一遍完成；窗口不满或含NaN时为NaN"""
+    values = np.asarray(values, dtype=np.float64)
+    if bn is not None and 1 <= window <= len(values):
+        return bn.move_mean(values, window=window, min_count=window)
+    result = np.full(len(values), np.nan)
+    if len(values) < window:
+        return result
+    missing = np.isnan(values)
+    sums = np.cumsum(np.concatenate(([0.0], np.where(missing, 0.0, values))))
+    missing_counts = np.cumsum(np.concatenate(([0], missing)))
+    window_sums = sums[window:] - sums[:-window]
+    window_missing = missing_counts[window:] - missing_counts[:-window]
+    result[window - 1:] = np.where(window_missing == 0, window_sums / window, np.nan)
+    return result
+
+def _rolling_max(values: np.ndarray, window: int) -> np.ndarray:
+    """滚动最大值；窗口不满或含NaN时为NaN"""
+    values = np.asarray(values, dtype=np.float64)
+    if bn is not None and 1 <= window <= len(values):
+        return bn.move_max(values, window=window, min_count=window)
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1:] = sliding_window_view(values, window).max(axis=1)
+    return result
+
+def _rolling_min(values: np.ndarray, window: int) -> np.ndarray:
+    """滚动最小值；窗口不满或含NaN时为NaN"""
+    values = np.asarray(values, dtype=np.float64)
+    if bn is not None and 1 <= window <= len(values):
+        return bn.move_min(values, window=window, min_count=window)
+    result = np.full(len(values), np.nan)
+    if len(values) >= window:
+        result[window - 1:] = sliding_window_view(values, window).min(axis=1)
+    return result
+
+def _rising(values: np.ndarray, periods: int) -> np.ndarray:
+    """values[i] > values[i - periods]，前periods个为False（直接比较两个切片视图，不构造平移数组）"""
+    result = np.zeros(len(values), dtype=bool)
+    result[periods:] = values[periods:] > values[:len(values) - periods]
+    return result
+
+def _falling(values: np.ndarray, periods: int) -> np.ndarray:
+    """values[i] < values[i - periods]，前periods个为False"""
+    result = np.zeros(len(values), dtype=bool)
+    result[periods:] = values[periods:] < values[:len(values) - periods]
+    return result
+
+def _near_level(close: np.ndarray, levels: List[float], tolerance: float,
+                highest: bool = False) -> Tuple[np.ndarray, np.ndarray]:
+    """为每个价格找出相对距离小于tolerance的价位中最低（highest=True时最高）的一个
+    
+    |p - s| / s < tol 等价于 p / (1 + tol) < s < p / (1 - tol)，在排序后的价位上二分查找区间端点，
+    每根K线O(log K)，无需构造N×K的距离矩阵。返回(是否存在, 对应价位)
+    """
+    levels = np.sort(np.asarray(levels, dtype=np.float64))
+    with np.errstate(invalid='ignore'):
+        if highest:
+            idx = np.searchsorted(levels, close / (1 - tolerance), side='left') - 1
+        else:
+            idx = np.searchsorted(levels, close / (1 + tolerance), side='right')
+    level = levels[np.clip(idx, 0, len(levels) - 1)]
+    with np.errstate(invalid='ignore'):
+        near = (idx >= 0) & (idx < len(levels)) & (np.abs(close - level) / level < tolerance)
+    return near, level
+
+# 共享指标中的20周期滚动统计，comprehensive_signal_pl可在外部一次算好后传入
+ROLLING_CONTEXT_KEYS = ('sma20', 'vol_ma20', 'high_max20', 'low_min20')
+
+def _precompute(data: pd.DataFrame, rolling: Optional[Dict[str, np.ndarray]] = None) -> Dict:
+    """预先计算各子信号共用的指标（20周期均线/极值、布林带、ADX、ATR、支撑阻力位等），每份数据只算一次
+    
+    rolling: 已算好的20周期滚动统计（键见ROLLING_CONTEXT_KEYS），传入时直接复用
+    """
+    close, high, low = data['close'], data['high'], data['low']
+    index = data.index
+    if rolling is None:
+        rolling = {
+            'sma20': tech_indicators.sma(close, 20).to_numpy(),
+            'vol_ma20': _rolling_mean(data['volume'].to_numpy(), 20),
+            'high_max20': _rolling_max(high.to_numpy(), 20),
+            'low_min20': _rolling_min(low.to_numpy(), 20),
+        }
+    ctx = {name: pd.Series(rolling[name], index=index) for name in ROLLING_CONTEXT_KEYS}
+    return {
+        'close': close.to_numpy(dtype=np.float64),
+        **ctx,
+        'bb': tech_indicators.bollinger_bands(close, middle=ctx['sma20']),
+        'trend_strength': tech_indicators.trend_strength(close),
+        'adx_pack': tech_indicators.adx(high, low, close),
+        'atr': tech_indicators.atr(high, low, close),
+        'sr': tech_indicators.support_resistance_levels(high, low, close),
+    }
+
 class TradingSignalGenerator:
     """交易信号生成器"""
     
+    # 综合信号中并行计算各子信号的线程数（8个子信号各占一个线程）；
+    # numpy运算期间释放GIL，可以并行，pandas的Python层开销仍受GIL限制串行执行
+    SIGNAL_WORKERS = 8
+    SIGNAL_CACHE_SIZE = 32  # 子信号结果缓存条数
+    
     def __init__(self):
         self.logger = logging.getLogger(__name__)
         self.signals_history = []
+        self._executor = None  # 首次计算综合信号时再创建线程池
+        self._signal_cache = OrderedDict()  # (方法, 数据指纹, 参数) -> 信号，LRU
+        self._signal_cache_lock = threading.Lock()  # 子信号在线程池中并行计算
+        self._ma_funcs = {'sma': tech_indicators.sma, 'ema': tech_indicators.ema}  # 均线类型 -> 计算函数
     
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """获取计算子信号用的线程池"""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.SIGNAL_WORKERS, thread_name_prefix="signal"
+            )
+        return self._executor
+    
+    def shutdown(self):
+        """关闭子信号线程池（之后再计算综合信号时会重新创建）"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    @_cached_signal
     def ma_crossover_signal(self, data: pd.DataFrame, fast_period: int = 5, 
-                           slow_period: int = 20, signal_type: str = 'sma') -> pd.Series:
-        """移动平均线交叉信号"""
+                           slow_period: int = 20, signal_type: str = 'sma',
+                           ctx: Optional[Dict] = None) -> pd.Series:
+        """移动平均线交叉信号
+        
+        ctx: _precompute得到的共享指标，传入时复用其中的均线
+        """
         try:
-            if signal_type == 'sma':
-                fast_ma = tech_indicators.sma(data['close'], fast_period)
-                slow_ma = tech_indicators.sma(data['close'], slow_period)
-            elif signal_type == 'ema':
-                fast_ma = tech_indicators.ema(data['close'], fast_period)
-                slow_ma = tech_indicators.ema(data['close'], slow_period)
-            else:
+            ma_func = self._ma_funcs.get(signal_type)
+            if ma_func is None:
                 raise ValueError("signal_type must be 'sma' or 'ema'")
             
-            # 计算交叉信号
-            signals = pd.Series(0, index=data.index)
+            fast_ma = ma_func(data['close'], fast_period)
+            if ctx is not None and signal_type == 'sma' and slow_period == 20:
+                slow_ma = ctx['sma20']
+            else:
+                slow_ma = ma_func(data['close'], slow_period)
+            
+            # 计算交叉信号（只对快慢线差值做一次平移）
+            golden_cross, death_cross = _crossings(
+                fast_ma.to_numpy(dtype=np.float64) - slow_ma.to_numpy(dtype=np.float64)
+            )
+            signals = np.zeros(len(data), dtype=np.int8)
             
             # 金叉：快线上穿慢线 = 1 (买入信号)
-            signals[(fast_ma > slow_ma) & (fast_ma.shift(1) <= slow_ma.shift(1))] = 1
+            signals[golden_cross] = 1
             
             # 死叉：快线下穿慢线 = -1 (卖出信号)  
-            signals[(fast_ma < slow_ma) & (fast_ma.shift(1) >= slow_ma.shift(1))] = -1
+            signals[death_cross] = -1
             
-            return signals
+            return pd.Series(signals, index=data.index)
             
         except Exception as e:
-            self.logger.error(f"移动平均线交叉信号计算失败: {e}")
-            return pd.Series(0, index=data.index)
+            self.logger.error("移动平均线交叉信号计算失败: %s", e)
+            return pd.Series(0, index=data.index, dtype=np.int8)
     
-    def macd_signal(self, data: pd.DataFrame) -> pd.Series:
+    @_cached_signal
+    def macd_signal(self, data: pd.DataFrame, ctx: Optional[Dict] = None) -> pd.Series:
         """MACD信号"""
         try:
             macd_data = tech_indicators.macd(data['close'])
-            macd_line = macd_data['macd']
-            signal_line = macd_data['signal']
-            histogram = macd_data['histogram']
+            macd_line = macd_data['macd'].to_numpy(dtype=np.float64)
+            signal_line = macd_data['signal'].to_numpy(dtype=np.float64)
+            histogram = macd_data['histogram'].to_numpy(dtype=np.float64)
+            close = ctx['close'] if ctx is not None else data['close'].to_numpy(dtype=np.float64)
+            golden_cross, death_cross = _crossings(macd_line - signal_line)
             
-            signals = pd.Series(0, index=data.index)
+            signals = np.zeros(len(data), dtype=np.int8)
             
             # MACD金叉且在零轴上方
-            golden_cross = (macd_line > signal_line) & (macd_line.shift(1) <= signal_line.shift(1))
             above_zero = macd_line > 0
             signals[golden_cross & above_zero] = 1
             
             # MACD死叉且在零轴下方
-            death_cross = (macd_line < signal_line) & (macd_line.shift(1) >= signal_line.shift(1))
             below_zero = macd_line < 0
             signals[death_cross & below_zero] = -1
             
             # 柱状图背离信号
-            price_higher = data['close'] > data['close'].shift(5)
-            histogram_lower = histogram < histogram.shift(5)
+            price_higher = _rising(close, 5)
+            histogram_lower = _falling(histogram, 5)
             bearish_divergence = price_higher & histogram_lower & (histogram > 0)
-            signals[bearish_divergence] = -1
+            if bearish_divergence.any():
+                signals[bearish_divergence] = -1
             
-            price_lower = data['close'] < data['close'].shift(5)
-            histogram_higher = histogram > histogram.shift(5)
+            price_lower = _falling(close, 5)
+            histogram_higher = _rising(histogram, 5)
             bullish_divergence = price_lower & histogram_higher & (histogram < 0)
-            signals[bullish_divergence] = 1
+            if bullish_divergence.any():
+                signals[bullish_divergence] = 1
             
-            return signals
+            return pd.Series(signals, index=data.index)
             
         except Exception as e:
-            self.logger.error(f"MACD信号计算失败: {e}")
-            return pd.Series(0, index=data.index)
+            self.logger.error("MACD信号计算失败: %s", e)
+            return pd.Series(0, index=data.index, dtype=np.int8)
     
+    @_cached_signal
     def rsi_signal(self, data: pd.DataFrame, oversold: float = 30, 
-                   overbought: float = 70) -> pd.Series:
+                   overbought: float = 70, ctx: Optional[Dict] = None) -> pd.Series:
         """RSI信号"""
         try:
-            rsi = tech_indicators.rsi(data['close'])
-            signals = pd.Series(0, index=data.index)
+            rsi = tech_indicators.rsi(data['close']).to_numpy(dtype=np.float64)
+            close = ctx['close'] if ctx is not None else data['close'].to_numpy(dtype=np.float64)
+            rsi_prev = _shift(rsi)
+            signals = np.zeros(len(data), dtype=np.int8)
             
             # RSI从超卖区域向上突破
-            rsi_bullish = (rsi > oversold) & (rsi.shift(1) <= oversold)
+            rsi_bullish = (rsi > oversold) & (rsi_prev <= oversold)
             signals[rsi_bullish] = 1
             
             # RSI从超买区域向下突破
-            rsi_bearish = (rsi < overbought) & (rsi.shift(1) >= overbought)
+            rsi_bearish = (rsi < overbought) & (rsi_prev >= overbought)
             signals[rsi_bearish] = -1
             
             # RSI背离
-            price_higher = data['close'] > data['close'].shift(10)
-            rsi_lower = rsi < rsi.shift(10)
+            price_higher = _rising(close, 10)
+            rsi_lower = _falling(rsi, 10)
             bearish_divergence = price_higher & rsi_lower & (rsi > 50)
-            signals[bearish_divergence] = -1
+            if bearish_divergence.any():
+                signals[bearish_divergence] = -1
             
-            price_lower = data['close'] < data['close'].shift(10)
-            rsi_higher = rsi > rsi.shift(10)
+            price_lower = _falling(close, 10)
+            rsi_higher = _rising(rsi, 10)
             bullish_divergence = price_lower & rsi_higher & (rsi < 50)
-            signals[bullish_divergence] = 1
+            if bullish_divergence.any():
+                signals[bullish_divergence] = 1
             
-            return signals
+            return pd.Series(signals, index=data.index)
             
         except Exception as e:
-            self.logger.error(f"RSI信号计算失败: {e}")
-            return pd.Series(0, index=data.index)
+            self.logger.error("RSI信号计算失败: %s", e)
+            return pd.Series(0, index=data.index, dtype=np.int8)
     
-    def bollinger_bands_signal(self, data: pd.DataFrame) -> pd.Series:
+    @_cached_signal
+    def bollinger_bands_signal(self, data: pd.DataFrame, ctx: Optional[Dict] = None) -> pd.Series:
         """布林带信号"""
         try:
-            bb_data = tech_indicators.bollinger_bands(data['close'])
-            upper = bb_data['upper']
-            lower = bb_data['lower']
-            middle = bb_data['middle']
-            bandwidth = bb_data['bandwidth']
+            bb_data = ctx['bb'] if ctx is not None else tech_indicators.bollinger_bands(data['close'])
+            upper = bb_data['upper'].to_numpy(dtype=np.float64)
+            lower = bb_data['lower'].to_numpy(dtype=np.float64)
+            bandwidth = bb_data['bandwidth'].to_numpy(dtype=np.float64)
+            close = ctx['close'] if ctx is not None else data['close'].to_numpy(dtype=np.float64)
             
-            signals = pd.Series(0, index=data.index)
+            signals = np.zeros(len(data), dtype=np.int8)
             
             # 价格从下轨反弹
-            bounce_from_lower = (data['close'] > lower) & (data['close'].shift(1) <= lower.shift(1))
+            bounce_from_lower, _ = _crossings(close - lower)
             signals[bounce_from_lower] = 1
             
             # 价格从上轨回落
-            rejection_from_upper = (data['close'] < upper) & (data['close'].shift(1) >= upper.shift(1))
+            _, rejection_from_upper = _crossings(close - upper)
             signals[rejection_from_upper] = -1
             
             # 布林带收缩后的突破
-            squeeze = bandwidth < bandwidth.rolling(window=20).mean() * 0.8
-            breakout_up = squeeze & (data['close'] > upper)
-            breakout_down = squeeze & (data['close'] < lower)
+            squeeze = bandwidth < _rolling_mean(bandwidth, 20) * 0.8
+            breakout_up = squeeze & (close > upper)
+            breakout_down = squeeze & (close < lower)
             
             signals[breakout_up] = 1
             signals[breakout_down] = -1
             
-            return signals
+            return pd.Series(signals, index=data.index)
             
         except Exception as e:
-            self.logger.error(f"布林带信号计算失败: {e}")
-            return pd.Series(0, index=data.index)
+            self.logger.error("布林带信号计算失败: %s", e)
+            return pd.Series(0, index=data.index, dtype=np.int8)
     
-    def wyckoff_signal(self, data: pd.DataFrame) -> pd.Series:
+    @_cached_signal
+    def wyckoff_signal(self, data: pd.DataFrame, ctx: Optional[Dict] = None) -> pd.Series:
         """维科夫量价分析信号"""
         try:
             # 计算维科夫指标
             ad_line = tech_indicators.wyckoff_accumulation_distribution(
                 data['high'], data['low'], data['close'], data['volume']
-            )
-            pvt = tech_indicators.wyckoff_price_volume_trend(data['close'], data['volume'])
+            ).to_numpy()
+            pvt = tech_indicators.wyckoff_price_volume_trend(data['close'], data['volume']).to_numpy()
+            close = ctx['close'] if ctx is not None else data['close'].to_numpy(dtype=np.float64)
+            volume = data['volume'].to_numpy(dtype=np.float64)
             
-            signals = pd.Series(0, index=data.index)
+            signals = np.zeros(len(data), dtype=np.int8)
             
             # 价格上涨但A/D线下降 - 看跌背离
-            price_rising = data['close'] > data['close'].shift(5)
-            ad_falling = ad_line < ad_line.shift(5)
+            price_rising = _rising(close, 5)
+            ad_falling = _falling(ad_line, 5)
             bearish_divergence = price_rising & ad_falling
-            signals[bearish_divergence] = -1
+            has_bearish = bearish_divergence.any()
+            if has_bearish:
+                signals[bearish_divergence] = -1
             
             # 价格下跌但A/D线上升 - 看涨背离
-            price_falling = data['close'] < data['close'].shift(5)
-            ad_rising = ad_line > ad_line.shift(5)
+            price_falling = _falling(close, 5)
+            ad_rising = _rising(ad_line, 5)
             bullish_divergence = price_falling & ad_rising
-            signals[bullish_divergence] = 1
-            
-            # PVT确认信号
-            pvt_rising = pvt > pvt.shift(3)
-            pvt_falling = pvt < pvt.shift(3)
+            has_bullish = bullish_divergence.any()
+            if has_bullish:
+                signals[bullish_divergence] = 1
             
-            # 加强信号强度
-            signals[bullish_divergence & pvt_rising] = 2
-            signals[bearish_divergence & pvt_falling] = -2
+            # PVT确认信号，加强信号强度（没有背离时无需确认）
+            if has_bullish:
+                signals[bullish_divergence & _rising(pvt, 3)] = 2
+            if has_bearish:
+                signals[bearish_divergence & _falling(pvt, 3)] = -2
             
             # 成交量分析
-            avg_volume = data['volume'].rolling(window=20).mean()
-            high_volume = data['volume'] > avg_volume * 1.5
+            if ctx is not None:
+                avg_volume = ctx['vol_ma20'].to_numpy()
+                high_max = ctx['high_max20'].to_numpy()
+                low_min = ctx['low_min20'].to_numpy()
+            else:
+                avg_volume = _rolling_mean(volume, 20)
+                high_max = _rolling_max(data['high'].to_numpy(), 20)
+                low_min = _rolling_min(data['low'].to_numpy(), 20)
+            high_volume = volume > avg_volume * 1.5
             
             # 高成交量确认突破
-            price_breakout_up = data['close'] > data['high'].rolling(window=20).max().shift(1)
-            price_breakout_down = data['close'] < data['low'].rolling(window=20).min().shift(1)
+            price_breakout_up = close > _shift(high_max)
+            price_breakout_down = close < _shift(low_min)
             
             signals[price_breakout_up & high_volume] = 2
             signals[price_breakout_down & high_volume] = -2
             
-            return signals
+            return pd.Series(signals, index=data.index)
             
         except Exception as e:
-            self.logger.error(f"维科夫信号计算失败: {e}")
-            return pd.Series(0, index=data.index)
+            self.logger.error("维科夫信号计算失败: %s", e)
+            return pd.Series(0, index=data.index, dtype=np.int8)
     
-    def support_resistance_signal(self, data: pd.DataFrame) -> pd.Series:
+    @_cached_signal
+    def support_resistance_signal(self, data: pd.DataFrame, ctx: Optional[Dict] = None) -> pd.Series:
         """支撑阻力位信号"""
         try:
-            sr_levels = tech_indicators.support_resistance_levels(
-                data['high'], data['low'], data['close']
-            )
+            if ctx is not None:
+                sr_levels = ctx['sr']
+            else:
+                sr_levels = tech_indicators.support_resistance_levels(
+                    data['high'], data['low'], data['close']
+                )
             
             resistance_levels = sr_levels['resistance_levels']
             support_levels = sr_levels['support_levels']
             
-            signals = pd.Series(0, index=data.index)
+            signals = np.zeros(len(data), dtype=np.int8)
             
             if not resistance_levels or not support_levels:
-                return signals
+                return pd.Series(signals, index=data.index)
             
-            # 检查价格与支撑阻力位的关系
-            for i, price in enumerate(data['close']):
-                if pd.isna(price):
-                    continue
-                
-                # 检查是否接近支撑位
-                for support in support_levels:
-                    if abs(price - support) / support < 0.02:  # 2%容忍度
-                        # 如果价格从下方接近支撑位
-                        if i > 0 and data['close'].iloc[i-1] < support:
-                            signals.iloc[i] = 1
-                        break
-                
-                # 检查是否接近阻力位
-                for resistance in resistance_levels:
-                    if abs(price - resistance) / resistance < 0.02:  # 2%容忍度
-                        # 如果价格从上方接近阻力位
-                        if i > 0 and data['close'].iloc[i-1] > resistance:
-                            signals.iloc[i] = -1
-                        break
+            close = ctx['close'] if ctx is not None else data['close'].to_numpy(dtype=np.float64)
+            prev_close = _shift(close)  # 第一根K线没有前值
             
-            return signals
+            # 检查价格与支撑阻力位的关系：每根K线只看列表中第一个距离在2%以内的价位
+            # （支撑位升序即最低的一个，阻力位降序即最高的一个）
+            # 价格从下方接近支撑位
+            near_support, support = _near_level(close, support_levels, 0.02)
+            signals[near_support & (prev_close < support)] = 1
+            
+            # 价格从上方接近阻力位
+            near_resistance, resistance = _near_level(close, resistance_levels, 0.02, highest=True)
+            signals[near_resistance & (prev_close > resistance)] = -1
+            
+            return pd.Series(signals, index=data.index)
             
         except Exception as e:
-            self.logger.error(f"支撑阻力位信号计算失败: {e}")
-            return pd.Series(0, index=data.index)
+            self.logger.error("支撑阻力位信号计算失败: %s", e)
+            return pd.Series(0, index=data.index, dtype=np.int8)
     
-    def trend_following_signal(self, data: pd.DataFrame) -> pd.Series:
+    @_cached_signal
+    def trend_following_signal(self, data: pd.DataFrame, ctx: Optional[Dict] = None) -> pd.Series:
         """趋势跟随信号"""
         try:
             # 计算ADX判断趋势强度
-            adx_data = tech_indicators.adx(data['high'], data['low'], data['close'])
-            adx = adx_data['adx']
-            plus_di = adx_data['plus_di']
-            minus_di = adx_data['minus_di']
+            if ctx is not None:
+                adx_data = ctx['adx_pack']
+            else:
+                adx_data = tech_indicators.adx(data['high'], data['low'], data['close'])
+            adx = adx_data['adx'].to_numpy(dtype=np.float64)
+            plus_di = adx_data['plus_di'].to_numpy(dtype=np.float64)
+            minus_di = adx_data['minus_di'].to_numpy(dtype=np.float64)
             
             # 计算趋势强度
-            trend_strength = tech_indicators.trend_strength(data['close'])
+            if ctx is not None:
+                trend_strength = ctx['trend_strength'].to_numpy(dtype=np.float64)
+            else:
+                trend_strength = tech_indicators.trend_strength(data['close']).to_numpy(dtype=np.float64)
             
-            signals = pd.Series(0, index=data.index)
+            signals = np.zeros(len(data), dtype=np.int8)
             
             # 强趋势定义：ADX > 25 且趋势强度 > 0.5
             strong_trend = (adx > 25) & (trend_strength > 0.5)
             
-            # 上升趋势：+DI > -DI
-            uptrend = plus_di > minus_di
-            # 下降趋势：-DI > +DI
-            downtrend = minus_di > plus_di
+            # 上升趋势：+DI > -DI；下降趋势：-DI > +DI
+            di_diff = plus_di - minus_di
+            uptrend = di_diff > 0
+            downtrend = di_diff < 0
             
             # 趋势跟随信号
             signals[strong_trend & uptrend] = 1
             signals[strong_trend & downtrend] = -1
             
             # 趋势反转信号
-            trend_reversal_up = (plus_di > minus_di) & (plus_di.shift(1) <= minus_di.shift(1))
-            trend_reversal_down = (minus_di > plus_di) & (minus_di.shift(1) <= plus_di.shift(1))
+            trend_reversal_up, trend_reversal_down = _crossings(di_diff)
             
             signals[trend_reversal_up & (adx > 20)] = 1
             signals[trend_reversal_down & (adx > 20)] = -1
             
-            return signals
+            return pd.Series(signals, index=data.index)
             
         except Exception as e:
-            self.logger.error(f"趋势跟随信号计算失败: {e}")
-            return pd.Series(0, index=data.index)
+            self.logger.error("趋势跟随信号计算失败: %s", e)
+            return pd.Series(0, index=data.index, dtype=np.int8)
     
-    def breakout_signal(self, data: pd.DataFrame, lookback: int = 20) -> pd.Series:
+    @_cached_signal
+    def breakout_signal(self, data: pd.DataFrame, lookback: int = 20,
+                        ctx: Optional[Dict] = None) -> pd.Series:
         """突破信号"""
         try:
-            breakout_data = tech_indicators.breakout_potential(
-                data['high'], data['low'], data['close'], data['volume']
-            )
-            
-            signals = pd.Series(0, index=data.index)
+            if ctx is not None:
+                breakout_data = tech_indicators.breakout_potential(
+                    data['high'], data['low'], data['close'], data['volume'],
+                    rolling_high_max=ctx['high_max20'], rolling_low_min=ctx['low_min20'],
+                    rolling_vol_mean=ctx['vol_ma20'], bb=ctx['bb']
+                )
+            else:
+                breakout_data = tech_indicators.breakout_potential(
+                    data['high'], data['low'], data['close'], data['volume']
+                )
             
-            # 向上突破信号
-            upward_breakout = (
-                (data['close'] > data['high'].rolling(window=lookback).max().shift(1)) &
-                (breakout_data['volume_spike'] == 1)
-            )
-            signals[upward_breakout] = 2  # 强烈买入信号
+            close = ctx['close'] if ctx is not None else data['close'].to_numpy(dtype=np.float64)
+            volume_spike = breakout_data['volume_spike'].to_numpy() == 1
             
-            # 向下突破信号
-            downward_breakout = (
-                (data['close'] < data['low'].rolling(window=lookback).min().shift(1)) &
-                (breakout_data['volume_spike'] == 1)
-            )
-            signals[downward_breakout] = -2  # 强烈卖出信号
+            # 向上/向下突破前lookback根K线的最高价/最低价且放量
+            if ctx is not None and lookback == 20:
+                high_max = ctx['high_max20'].to_numpy()
+                low_min = ctx['low_min20'].to_numpy()
+            else:
+                high_max = _rolling_max(data['high'].to_numpy(), lookback)
+                low_min = _rolling_min(data['low'].to_numpy(), lookback)
+            upward_breakout = volume_spike & (close > _shift(high_max))
+            downward_breakout = volume_spike & (close < _shift(low_min))
             
             # 布林带收缩突破
-            bb_breakout_up = breakout_data['breakout_up'] == 1
-            bb_breakout_down = breakout_data['breakout_down'] == 1
+            bb_breakout_up = breakout_data['breakout_up'].to_numpy() == 1
+            bb_breakout_down = breakout_data['breakout_down'].to_numpy() == 1
             
-            signals[bb_breakout_up] = 1
-            signals[bb_breakout_down] = -1
+            # 同一根K线满足多个条件时取最强的信号
+            signals = np.select(
+                [upward_breakout, downward_breakout, bb_breakout_up, bb_breakout_down],
+                [2, -2, 1, -1],  # 强烈买入、强烈卖出、买入、卖出
+                default=0
+            ).astype(np.int8)
             
-            return signals
+            return pd.Series(signals, index=data.index)
             
         except Exception as e:
-            self.logger.error(f"突破信号计算失败: {e}")
-            return pd.Series(0, index=data.index)
+            self.logger.error("突破信号计算失败: %s", e)
+            return pd.Series(0, index=data.index, dtype=np.int8)
     
-    def comprehensive_signal(self, data: pd.DataFrame, weights: Dict[str, float] = None) -> Dict:
-        """综合信号生成"""
+    def comprehensive_signal(self, data: pd.DataFrame, weights: Dict[str, float] = None,
+                             ctx: Optional[Dict] = None) -> Dict:
+        """综合信号生成
+        
+        ctx: _precompute得到的共享指标，未传入时在此计算一次后分发给各子信号
+        """
         try:
             if weights is None:
                 weights = {
@@ -326,36 +552,43 @@ class TradingSignalGenerator:
                     'breakout': 1.4
                 }
             
-            # 计算各个信号
-            signals = {}
-            signals['ma_crossover'] = self.ma_crossover_signal(data)
-            signals['macd'] = self.macd_signal(data)
-            signals['rsi'] = self.rsi_signal(data)
-            signals['bollinger'] = self.bollinger_bands_signal(data)
-            signals['wyckoff'] = self.wyckoff_signal(data)
-            signals['support_resistance'] = self.support_resistance_signal(data)
-            signals['trend_following'] = self.trend_following_signal(data)
-            signals['breakout'] = self.breakout_signal(data)
-            
-            # 计算加权综合信号
-            weighted_signal = pd.Series(0.0, index=data.index)
-            total_weight = 0
-            
-            for signal_name, signal_values in signals.items():
-                if signal_name in weights:
-                    weighted_signal += signal_values * weights[signal_name]
-                    total_weight += weights[signal_name]
-            
-            # 标准化信号强度
-            if total_weight > 0:
-                weighted_signal = weighted_signal / total_weight
-            
-            # 生成最终交易信号
-            final_signals = pd.Series(0, index=data.index)
-            final_signals[weighted_signal > 0.3] = 1    # 买入信号
-            final_signals[weighted_signal > 0.6] = 2    # 强烈买入信号
-            final_signals[weighted_signal < -0.3] = -1  # 卖出信号
-            final_signals[weighted_signal < -0.6] = -2  # 强烈卖出信号
+            if ctx is None:
+                ctx = _precompute(data)
+            
+            # 计算各个信号（互不依赖，并行执行）
+            executor = self._get_executor()
+            futures = {
+                'ma_crossover': executor.submit(self.ma_crossover_signal, data, ctx=ctx),
+                'macd': executor.submit(self.macd_signal, data, ctx=ctx),
+                'rsi': executor.submit(self.rsi_signal, data, ctx=ctx),
+                'bollinger': executor.submit(self.bollinger_bands_signal, data, ctx=ctx),
+                'wyckoff': executor.submit(self.wyckoff_signal, data, ctx=ctx),
+                'support_resistance': executor.submit(self.support_resistance_signal, data, ctx=ctx),
+                'trend_following': executor.submit(self.trend_following_signal, data, ctx=ctx),
+                'breakout': executor.submit(self.breakout_signal, data, ctx=ctx)
+            }
+            signals = {name: future.result() for name, future in futures.items()}
+            
+            # 计算加权综合信号：各子信号堆叠为矩阵，一次矩阵乘法完成加权求和
+            names = [name for name in signals if name in weights]
+            weighted = np.zeros(len(data))
+            if names:
+                stack = np.vstack([signals[name].to_numpy(dtype=np.float64) for name in names])
+                weight_values = np.array([weights[name] for name in names], dtype=np.float64)
+                weighted = weight_values @ stack
+                
+                # 标准化信号强度
+                total_weight = weight_values.sum()
+                if total_weight > 0:
+                    weighted = weighted / total_weight
+            weighted_signal = pd.Series(weighted, index=data.index)
+            
+            # 生成最终交易信号（按强到弱的顺序取第一个满足的条件）
+            final_signals = pd.Series(np.select(
+                [weighted > 0.6, weighted > 0.3, weighted < -0.6, weighted < -0.3],
+                [2, 1, -2, -1],  # 强烈买入、买入、强烈卖出、卖出
+                default=0
+            ).astype(np.int8), index=data.index)
             
             # 计算信号统计
             signal_stats = {
@@ -375,82 +608,152 @@ class TradingSignalGenerator:
             }
             
         except Exception as e:
-            self.logger.error(f"综合信号计算失败: {e}")
+            self.logger.error("综合信号计算失败: %s", e)
             return {}
     
-    def market_regime_detection(self, data: pd.DataFrame) -> pd.Series:
-        """市场状态检测"""
+    def comprehensive_signal_pl(self, df_pl: "pl.DataFrame", weights: Dict[str, float] = None) -> Dict:
+        """以polars DataFrame为输入的综合信号
+        
+        20周期滚动统计在一次with_columns中由polars多线程计算，转换为pandas后作为共享指标
+        传给comprehensive_signal，其余子信号逻辑与pandas路径相同
+        """
         try:
-            # 检测震荡市场
-            sideways = tech_indicators.sideways_market_detection(
-                data['high'], data['low'], data['close']
-            )
+            if pl is None:
+                raise ImportError("comprehensive_signal_pl需要安装polars")
             
-            # 检测趋势市场
-            trend_strength = tech_indicators.trend_strength(data['close'])
-            adx_data = tech_indicators.adx(data['high'], data['low'], data['close'])
-            adx = adx_data['adx']
+            enriched = df_pl.with_columns([
+                pl.col('close').cast(pl.Float64).rolling_mean(window_size=20).alias('sma20'),
+                pl.col('volume').cast(pl.Float64).rolling_mean(window_size=20).alias('vol_ma20'),
+                pl.col('high').cast(pl.Float64).rolling_max(window_size=20).alias('high_max20'),
+                pl.col('low').cast(pl.Float64).rolling_min(window_size=20).alias('low_min20'),
+            ]).to_pandas()
             
-            # 市场状态分类
-            market_regime = pd.Series('unknown', index=data.index)
+            rolling = {name: enriched[name].to_numpy(dtype=np.float64) for name in ROLLING_CONTEXT_KEYS}
+            data = enriched.drop(columns=list(ROLLING_CONTEXT_KEYS))
+            return self.comprehensive_signal(data, weights, ctx=_precompute(data, rolling))
             
-            # 震荡市场
-            market_regime[sideways == 1] = 'sideways'
+        except Exception as e:
+            self.logger.error("polars综合信号计算失败: %s", e)
+            return {}
+    
+    def market_regime_detection(self, data: pd.DataFrame, ctx: Optional[Dict] = None) -> pd.Series:
+        """市场状态检测，返回int8编码（含义见REGIME_CODES）"""
+        try:
+            # 检测趋势市场
+            if ctx is not None:
+                trend_strength = ctx['trend_strength']
+                adx_data = ctx['adx_pack']
+                rolling_extremes = {'rolling_high_max': ctx['high_max20'],
+                                    'rolling_low_min': ctx['low_min20']}
+            else:
+                trend_strength = tech_indicators.trend_strength(data['close'])
+                adx_data = tech_indicators.adx(data['high'], data['low'], data['close'])
+                rolling_extremes = {}
+            adx = adx_data['adx'].to_numpy()
             
-            # 强趋势市场
-            strong_trend = (adx > 25) & (trend_strength > 0.6)
-            market_regime[strong_trend] = 'trending'
+            # 检测震荡市场（复用上面的趋势强度）
+            sideways = tech_indicators.sideways_market_detection(
+                data['high'], data['low'], data['close'], trend_strength_values=trend_strength,
+                **rolling_extremes
+            ).to_numpy()
             
-            # 弱趋势市场
+            trend_strength = trend_strength.to_numpy()
+            strong_trend = (adx > 25) & (trend_strength > 0.6)
             weak_trend = (adx > 15) & (adx <= 25) & (trend_strength > 0.3)
-            market_regime[weak_trend] = 'weak_trend'
             
-            return market_regime
+            # 市场状态分类：弱趋势 > 强趋势 > 震荡 > 未知
+            market_regime = np.select(
+                [weak_trend, strong_trend, sideways == 1],
+                [REGIME_CODES['weak_trend'], REGIME_CODES['trending'], REGIME_CODES['sideways']],
+                default=REGIME_CODES['unknown']
+            ).astype(np.int8)
+            
+            return pd.Series(market_regime, index=data.index)
             
         except Exception as e:
-            self.logger.error(f"市场状态检测失败: {e}")
-            return pd.Series('unknown', index=data.index)
+            self.logger.error("市场状态检测失败: %s", e)
+            return pd.Series(REGIME_CODES['unknown'], index=data.index, dtype=np.int8)
     
-    def risk_adjustment(self, signals: pd.Series, data: pd.DataFrame) -> pd.Series:
-        """风险调整信号"""
+    def market_regime_last(self, data: pd.DataFrame, tail: int = 50,
+                           ctx: Optional[Dict] = None) -> str:
+        """最新一根K线的市场状态名称，只在最后tail根K线上检测
+        
+        ctx: _precompute得到的共享指标，传入时只取其尾部，结果与完整序列的最后一个值相同；
+        未传入时截取最后tail根K线重新计算，ADX的平滑预热只在这段数据内完成
+        """
+        try:
+            if data.empty:
+                return REGIME_NAMES[REGIME_CODES['unknown']]
+            
+            recent_ctx = None
+            if ctx is not None:
+                recent_ctx = {name: ctx[name].iloc[-tail:]
+                              for name in ('trend_strength', 'high_max20', 'low_min20')}
+                recent_ctx['adx_pack'] = {name: values.iloc[-tail:]
+                                          for name, values in ctx['adx_pack'].items()}
+            
+            market_regime = self.market_regime_detection(data.iloc[-tail:], ctx=recent_ctx)
+            return REGIME_NAMES[int(market_regime.iloc[-1])]
+            
+        except Exception as e:
+            self.logger.error("最新市场状态检测失败: %s", e)
+            return REGIME_NAMES[REGIME_CODES['unknown']]
+    
+    def risk_adjustment(self, signals: pd.Series, data: pd.DataFrame,
+                        market_regime: Optional[pd.Series] = None,
+                        ctx: Optional[Dict] = None) -> pd.Series:
+        """风险调整信号
+        
+        market_regime: 已计算好的市场状态，传入时不再重复检测
+        ctx: _precompute得到的共享指标，传入时复用其中的ATR
+        """
         try:
             # 计算ATR用于止损
-            atr = tech_indicators.atr(data['high'], data['low'], data['close'])
+            if ctx is not None:
+                atr = ctx['atr']
+            else:
+                atr = tech_indicators.atr(data['high'], data['low'], data['close'])
             
             # 检测市场状态
-            market_regime = self.market_regime_detection(data)
+            if market_regime is None:
+                market_regime = self.market_regime_detection(data, ctx=ctx)
             
-            # 调整后的信号
-            adjusted_signals = signals.copy()
+            # 震荡市场减弱信号强度，高波动期间降低信号强度，合并为一个系数数组
+            sideways_mask = np.asarray(market_regime) == REGIME_CODES['sideways']
+            atr_values = atr.to_numpy()
+            high_volatility = atr_values > _rolling_mean(atr_values, 20) * 1.5
             
-            # 在震荡市场中减弱信号强度
-            sideways_mask = market_regime == 'sideways'
-            adjusted_signals[sideways_mask] = adjusted_signals[sideways_mask] * 0.5
+            factor = np.ones(len(signals))
+            factor *= np.where(sideways_mask, 0.5, 1.0)
+            factor *= np.where(high_volatility, 0.7, 1.0)
             
-            # 在高波动期间降低信号强度
-            high_volatility = atr > atr.rolling(window=20).mean() * 1.5
-            adjusted_signals[high_volatility] = adjusted_signals[high_volatility] * 0.7
-            
-            return adjusted_signals.round().astype(int)
+            adjusted = np.rint(signals.to_numpy(dtype=np.float64) * factor).astype(np.int8)
+            return pd.Series(adjusted, index=signals.index)
             
         except Exception as e:
-            self.logger.error(f"风险调整失败: {e}")
+            self.logger.error("风险调整失败: %s", e)
             return signals
     
     def generate_trading_recommendation(self, data: pd.DataFrame) -> Dict:
         """生成交易建议"""
         try:
+            # 共享指标只计算一次，综合信号、市场状态和风险调整共用
+            ctx = _precompute(data)
+            
             # 获取综合信号
-            signal_result = self.comprehensive_signal(data)
+            signal_result = self.comprehensive_signal(data, ctx=ctx)
             
             if not signal_result:
                 return {}
             
             final_signals = signal_result['final_signal']
-            signal_strength = signal_result['signal_strength']
+            signal_strength = signal_result['weighted_signal']
+            
+            # 市场状态只检测一次，风险调整和返回结果共用
+            market_regime = self.market_regime_detection(data, ctx=ctx)
             
             # 风险调整
-            adjusted_signals = self.risk_adjustment(final_signals, data)
+            adjusted_signals = self.risk_adjustment(final_signals, data, market_regime=market_regime, ctx=ctx)
             
             # 获取最新信号
             latest_signal = adjusted_signals.iloc[-1] if len(adjusted_signals) > 0 else 0
@@ -473,10 +776,8 @@ class TradingSignalGenerator:
                 recommendation = "观望"
                 action = "建议保持当前仓位"
             
-            # 计算支撑阻力位
-            sr_levels = tech_indicators.support_resistance_levels(
-                data['high'], data['low'], data['close']
-            )
+            # 支撑阻力位复用共享指标中已计算的结果
+            sr_levels = ctx['sr']
             
             current_price = data['close'].iloc[-1]
             
@@ -487,12 +788,12 @@ class TradingSignalGenerator:
                 'current_price': float(current_price),
                 'support_levels': sr_levels['support_levels'][:3],  # 前3个支撑位
                 'resistance_levels': sr_levels['resistance_levels'][:3],  # 前3个阻力位
-                'market_regime': self.market_regime_detection(data).iloc[-1],
+                'market_regime': REGIME_NAMES[int(market_regime.iloc[-1])],
                 'timestamp': datetime.now().strftime('%Y-%m-%d %H:%M:%S')
             }
             
         except Exception as e:
-            self.logger.error(f"生成交易建议失败: {e}")
+            self.logger.error("生成交易建议失败: %s", e)
             return {}
 
 # 全局交易信号生成器实例